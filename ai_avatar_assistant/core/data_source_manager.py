@@ -46,11 +46,15 @@ class DataSource:
 class DataSourceManager:
     """Manages multiple data sources including JSON folders and external databases"""
     
-    def __init__(self, config_path: str = "data/data_sources.json"):
+    def __init__(self, config_path: str = "data/data_sources.json", http_session=None):
         self.config_path = config_path
         self.data_sources = {}
         self.logger = logging.getLogger(__name__)
         
+        # Shared keep-alive HTTP session for API sources, created on first use
+        self._http_session = http_session
+        self._http_lock = threading.Lock()
+        
         # File watcher settings
         self.watch_interval = 30  # seconds
         self.auto_sync = True
@@ -66,6 +70,10 @@ class DataSourceManager:
             "last_updated": None
         }
         
+        # Records handed over in memory; merged ahead of synced data on every update
+        self.preloaded_records = {}
+        self._cache_lock = threading.Lock()
+        
         # Load configuration
         self.load_configuration()
         
@@ -332,17 +340,38 @@ class DataSourceManager:
         except:
             return False
     
+    def get_http_session(self):
+        """Return the shared HTTP session, creating a pooled one if needed"""
+        if self._http_session is None:
+            with self._http_lock:
+                if self._http_session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+                    
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                          max_retries=Retry(total=2, backoff_factor=0.1))
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._http_session = session
+        return self._http_session
+    
+    def set_http_session(self, session):
+        """Use an externally managed HTTP session for API sources"""
+        self._http_session = session
+    
     def test_clickup(self, source: DataSource) -> bool:
         """Test ClickUp API connection"""
         try:
-            import requests
+            http = self.get_http_session()
             
             api_key = source.config.get("api_key")
             if not api_key:
                 return False
             
             headers = {"Authorization": api_key}
-            response = requests.get("https://api.clickup.com/api/v2/team", headers=headers)
+            response = http.get("https://api.clickup.com/api/v2/team", headers=headers)
             return response.status_code == 200
         except:
             return False
@@ -660,7 +689,7 @@ class DataSourceManager:
     def sync_clickup(self, source: DataSource):
         """Sync data from ClickUp API"""
         try:
-            import requests
+            http = self.get_http_session()
             
             api_key = source.config.get("api_key")
             team_id = source.config.get("team_id")
@@ -681,20 +710,20 @@ class DataSourceManager:
             
             # Get team members
             if team_id:
-                response = requests.get(f"https://api.clickup.com/api/v2/team/{team_id}", headers=headers)
+                response = http.get(f"https://api.clickup.com/api/v2/team/{team_id}", headers=headers)
                 if response.status_code == 200:
                     team_data = response.json()
                     data["team_members"] = team_data.get("team", {}).get("members", [])
             
             # Get spaces (projects)
-            response = requests.get("https://api.clickup.com/api/v2/team", headers=headers)
+            response = http.get("https://api.clickup.com/api/v2/team", headers=headers)
             if response.status_code == 200:
                 teams = response.json().get("teams", [])
                 for team in teams:
                     team_id = team["id"]
                     
                     # Get spaces
-                    spaces_response = requests.get(f"https://api.clickup.com/api/v2/team/{team_id}/space", headers=headers)
+                    spaces_response = http.get(f"https://api.clickup.com/api/v2/team/{team_id}/space", headers=headers)
                     if spaces_response.status_code == 200:
                         spaces = spaces_response.json().get("spaces", [])
                         data["projects"].extend(spaces)
@@ -702,19 +731,19 @@ class DataSourceManager:
                         # Get tasks from each space
                         for space in spaces:
                             # Get folders
-                            folders_response = requests.get(f"https://api.clickup.com/api/v2/space/{space['id']}/folder", headers=headers)
+                            folders_response = http.get(f"https://api.clickup.com/api/v2/space/{space['id']}/folder", headers=headers)
                             if folders_response.status_code == 200:
                                 folders = folders_response.json().get("folders", [])
                                 
                                 for folder in folders:
                                     # Get lists
-                                    lists_response = requests.get(f"https://api.clickup.com/api/v2/folder/{folder['id']}/list", headers=headers)
+                                    lists_response = http.get(f"https://api.clickup.com/api/v2/folder/{folder['id']}/list", headers=headers)
                                     if lists_response.status_code == 200:
                                         lists = lists_response.json().get("lists", [])
                                         
                                         for list_item in lists:
                                             # Get tasks
-                                            tasks_response = requests.get(f"https://api.clickup.com/api/v2/list/{list_item['id']}/task", headers=headers)
+                                            tasks_response = http.get(f"https://api.clickup.com/api/v2/list/{list_item['id']}/task", headers=headers)
                                             if tasks_response.status_code == 200:
                                                 tasks = tasks_response.json().get("tasks", [])
                                                 data["tasks"].extend(tasks)
@@ -726,6 +755,12 @@ class DataSourceManager:
     
     def update_unified_cache(self):
         """Update the unified data cache from all sources"""
+        # The monitor thread and preload_records both rebuild the cache
+        with self._cache_lock:
+            self._rebuild_unified_cache()
+    
+    def _rebuild_unified_cache(self):
+        """Merge preloaded and synced records into a fresh unified cache"""
         unified = {
             "projects": [],
             "tasks": [],
@@ -736,6 +771,11 @@ class DataSourceManager:
             "last_updated": datetime.now()
         }
         
+        # Preloaded records come first so they win deduplication
+        for data_type, records in self.preloaded_records.items():
+            if data_type in unified and data_type != "last_updated":
+                unified[data_type].extend(records)
+        
         # Merge data from all sources
         for source in self.data_sources.values():
             if source.is_active and source.cached_data:
@@ -763,6 +803,12 @@ class DataSourceManager:
         self.unified_cache = unified
         self.logger.info(f"Updated unified cache: {len(unified['projects'])} projects, {len(unified['tasks'])} tasks, {len(unified['team_members'])} team members")
     
+    def preload_records(self, records: Dict[str, List[Dict]]):
+        """Add records already in memory to the unified cache, skipping a sync"""
+        with self._cache_lock:
+            self.preloaded_records = {data_type: list(items) for data_type, items in records.items()}
+            self._rebuild_unified_cache()
+    
     def get_all_projects(self) -> List[Dict]:
         """Get all projects from all sources"""
         return self.unified_cache.get("projects", [])
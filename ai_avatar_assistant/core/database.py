@@ -82,6 +82,41 @@ class TaskDatabase:
             conn.commit()
             return task_id
     
+    def add_tasks_bulk(self, tasks: List[Dict]) -> List[int]:
+        """Add several tasks and their deadline events in a single transaction"""
+        task_ids = []
+        events = []
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            for task in tasks:
+                title = task["title"]
+                deadline = task.get("deadline")
+                cursor.execute('''
+                    INSERT INTO tasks (title, description, deadline, priority, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (title, task.get("description", ""), deadline, task.get("priority", 1),
+                      json.dumps(task.get("metadata") or {})))
+                
+                task_id = cursor.lastrowid
+                task_ids.append(task_id)
+                
+                # Same deadline events add_task creates
+                if deadline:
+                    events.append(("deadline_reminder", f"Task '{title}' is due soon!", "",
+                                   deadline - timedelta(hours=2), task_id))
+                    events.append(("deadline_warning", f"Task '{title}' is due!", "",
+                                   deadline, task_id))
+            
+            cursor.executemany('''
+                INSERT INTO events (event_type, title, message, trigger_time, task_id)
+                VALUES (?, ?, ?, ?, ?)
+            ''', events)
+            
+            conn.commit()
+        
+        return task_ids
+    
     def get_tasks(self, status: str = None, upcoming_hours: int = None) -> List[Dict]:
         """Get tasks from database with optional filtering"""
         with sqlite3.connect(self.db_path) as conn:
@@ -130,6 +165,24 @@ class TaskDatabase:
             conn.commit()
             return success
     
+    def update_tasks_status(self, task_ids: List[int], status: str) -> int:
+        """Update the status of several tasks in one statement"""
+        if not task_ids:
+            return 0
+        
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            placeholders = ", ".join("?" * len(task_ids))
+            cursor.execute(f'''
+                UPDATE tasks 
+                SET status = ?, updated_at = CURRENT_TIMESTAMP 
+                WHERE id IN ({placeholders})
+            ''', (status, *task_ids))
+            
+            updated = cursor.rowcount
+            conn.commit()
+            return updated
+    
     def add_event(self, event_type: str, title: str, trigger_time: datetime, 
                   task_id: int = None, message: str = "") -> int:
         """Add an event/notification"""
@@ -180,4 +233,18 @@ class TaskDatabase:
                 INSERT INTO user_actions (action_type, context, task_id)
                 VALUES (?, ?, ?)
             ''', (action_type, context, task_id))
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+    
+    def truncate_all(self, vacuum: bool = False):
+        """Delete all rows and reset ids, keeping the schema in place"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM events")
+            cursor.execute("DELETE FROM user_actions")
+            cursor.execute("DELETE FROM tasks")
+            cursor.execute("DELETE FROM sqlite_sequence")
+            conn.commit()
+            
+            # VACUUM cannot run inside a transaction, so it comes after the commit
+            if vacuum:
+                conn.execute("VACUUM")
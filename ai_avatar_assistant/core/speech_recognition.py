@@ -4,15 +4,76 @@ AI Avatar Assistant - Speech Recognition System
 Advanced speech-to-text capabilities for voice interactions
 """
 
+import io
 import os
+import re
 import json
 import time
 import threading
-import queue
 import logging
+from collections import deque
 from typing import Dict, List, Optional, Callable, Any
 from datetime import datetime
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=4).encode("utf-8")
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    sr = None
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# Sample rate expected by cloud ASR; anything above is wasted upload bandwidth
+ASR_SAMPLE_RATE = 16000
+
+if SPEECH_RECOGNITION_AVAILABLE:
+    # A subclass rather than a patch of sr.AudioData, so other users of the
+    # library in this process keep the stock encoder
+    class _InProcessFlacAudioData(sr.AudioData):
+        """AudioData that encodes FLAC in-process instead of spawning `flac`"""
+        
+        def get_flac_data(self, convert_rate=None, convert_width=None):
+            width = convert_width or self.sample_width
+            if width != 2:
+                return super().get_flac_data(convert_rate, convert_width)
+            
+            pcm = np.frombuffer(self.get_raw_data(convert_rate, convert_width), dtype=np.int16)
+            buffer = io.BytesIO()
+            soundfile.write(buffer, pcm, convert_rate or self.sample_rate, format="FLAC", subtype="PCM_16")
+            return buffer.getvalue()
+
+def _upload_audio_data(frame_data, sample_rate: int, sample_width: int):
+    """Build AudioData for a cloud upload, with in-process FLAC when available"""
+    if SOUNDFILE_AVAILABLE and NUMPY_AVAILABLE:
+        return _InProcessFlacAudioData(frame_data, sample_rate, sample_width)
+    return sr.AudioData(frame_data, sample_rate, sample_width)
+
 class SpeechRecognitionSystem:
     """Advanced speech recognition system for voice interactions"""
     
@@ -22,10 +83,16 @@ class SpeechRecognitionSystem:
         self.is_listening = False
         self.recognition_engine = None
         self.microphone = None
-        self.audio_queue = queue.Queue()
         self.recognition_thread = None
+        self.processing_thread = None
         self.callbacks = {}
+        self.wake_model = None
+        self._wake_until = 0.0
+        self._ewma_dur = 1.5
         self.config = self.load_configuration()
+        self._apply_configuration()
+        self._audio_ring = deque(maxlen=int(self.config.get("audio_queue_size", 8)))
+        self._audio_event = threading.Event()
         self.setup_recognition()
     
     def load_configuration(self) -> Dict[str, Any]:
@@ -47,31 +114,67 @@ class SpeechRecognitionSystem:
                 "help": ["help", "what can you do", "commands"]
             },
             "confidence_threshold": 0.7,
+            "audio_queue_size": 8,
+            "force_recalibrate": False,
+            "wake_word_model": None,  # e.g. "hey_jarvis" (requires openwakeword)
+            "wake_word_score": 0.5,
+            "wake_word_window": 8,
+            "adaptive_phrase_timeout": True,
+            "max_phrase_timeout": 8,
             "noise_suppression": True,
             "auto_gain": True
         }
         
         try:
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    loaded_config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    loaded_config = _loads(f.read())
                     default_config.update(loaded_config)
             else:
                 os.makedirs("data", exist_ok=True)
-                with open(config_path, 'w') as f:
-                    json.dump(default_config, f, indent=4)
+                with open(config_path, 'wb') as f:
+                    f.write(_dumps(default_config))
                 self.logger.info("Created default speech recognition configuration")
         except Exception as e:
             self.logger.error(f"Error loading speech config: {e}")
         
         return default_config
     
+    def _apply_configuration(self):
+        """Bind frequently used config values to attributes for hot paths"""
+        self._engine = self.config.get("engine", "auto")
+        self._lang = self.config.get("language", "en-US")
+        self._timeout = self.config.get("timeout", 5)
+        self._phrase_timeout = self.config.get("phrase_timeout", 0.3)
+        self._adaptive_phrase = self.config.get("adaptive_phrase_timeout", True)
+        self._max_phrase = max(0.5, float(self.config.get("max_phrase_timeout", 8)))
+        self._conf_threshold = float(self.config.get("confidence_threshold", 0.7))
+        self._dbg = self.logger.isEnabledFor(logging.DEBUG)
+        self._compile_matchers()
+    
+    def _compile_matchers(self):
+        """Precompile wake word and intent keyword patterns from the config"""
+        def build(phrases):
+            phrases = [p.lower() for p in phrases if p]
+            if not phrases:
+                return None
+            return re.compile("|".join(re.escape(p) for p in phrases))
+        
+        self._wake_pattern = build(self.config.get("wake_words", []))
+        self._intent_patterns = []
+        for intent, keywords in self.config.get("commands", {}).items():
+            pattern = build(keywords)
+            if pattern is not None:
+                self._intent_patterns.append((intent, pattern))
+    
     def setup_recognition(self):
         """Setup speech recognition engine"""
+        if not SPEECH_RECOGNITION_AVAILABLE:
+            self.logger.warning("SpeechRecognition library not available. Install with: pip install SpeechRecognition")
+            self.is_enabled = False
+            return
+        
         try:
-            # Try to import speech recognition library
-            import speech_recognition as sr
-            
             self.recognizer = sr.Recognizer()
             
             # Configure recognizer settings
@@ -84,13 +187,40 @@ class SpeechRecognitionSystem:
             
             # Setup microphone
             try:
-                self.microphone = sr.Microphone()
+                self.microphone = None
+                calibrated_threshold = self.config.get("calibrated_energy_threshold")
+                if calibrated_threshold is not None and not self.config.get("force_recalibrate", False):
+                    # Reuse the persisted device and calibration instead of probing again
+                    try:
+                        self.microphone = sr.Microphone(
+                            device_index=self.config.get("device_index"),
+                            sample_rate=self.config.get("sample_rate")
+                        )
+                        # Opening the stream fails if the device was unplugged or renumbered
+                        with self.microphone:
+                            pass
+                        self.recognizer.energy_threshold = calibrated_threshold
+                    except Exception as e:
+                        self.logger.warning(f"Saved microphone unavailable, recalibrating: {e}")
+                        self.microphone = None
                 
-                # Adjust for ambient noise
-                with self.microphone as source:
-                    self.logger.info("Adjusting for ambient noise...")
-                    self.recognizer.adjust_for_ambient_noise(source, duration=2)
+                if self.microphone is None:
+                    # Default device with a fresh calibration, replacing any persisted one
+                    self.microphone = sr.Microphone()
+                    
+                    # Adjust for ambient noise
+                    with self.microphone as source:
+                        self.logger.info("Adjusting for ambient noise...")
+                        self.recognizer.adjust_for_ambient_noise(source, duration=2)
+                    
+                    self.update_configuration({
+                        "calibrated_energy_threshold": self.recognizer.energy_threshold,
+                        "device_index": self.microphone.device_index,
+                        "sample_rate": self.microphone.SAMPLE_RATE,
+                        "force_recalibrate": False
+                    })
                 
+                self.setup_wake_word_model()
                 self.is_enabled = True
                 self.logger.info("Speech recognition system initialized successfully")
                 
@@ -98,13 +228,56 @@ class SpeechRecognitionSystem:
                 self.logger.warning(f"Microphone setup failed: {e}")
                 self.is_enabled = False
                 
-        except ImportError:
-            self.logger.warning("SpeechRecognition library not available. Install with: pip install SpeechRecognition")
-            self.is_enabled = False
         except Exception as e:
             self.logger.error(f"Speech recognition setup failed: {e}")
             self.is_enabled = False
     
+    def setup_wake_word_model(self):
+        """Load the optional local wake word model used to gate cloud recognition"""
+        model_name = self.config.get("wake_word_model")
+        if not model_name or not NUMPY_AVAILABLE:
+            return
+        
+        try:
+            import openwakeword
+            
+            # The ONNX backend ships int8-friendly models and avoids a torch dependency
+            self.wake_model = openwakeword.Model(
+                wakeword_models=[model_name], inference_framework="onnx"
+            )
+            self.logger.info(f"Local wake word model loaded: {model_name}")
+        except ImportError:
+            self.logger.warning("openwakeword not available. Install with: pip install openwakeword")
+        except Exception as e:
+            self.logger.warning(f"Wake word model setup failed: {e}")
+    
+    def _passes_wake_gate(self, audio) -> bool:
+        """Return False when the local model rules out a wake event outside the follow-up window
+        
+        Expects audio already prepared by _downsample_for_upload.
+        """
+        if self.wake_model is None or time.monotonic() < self._wake_until:
+            return True
+        if audio.sample_width != 2 or audio.sample_rate != ASR_SAMPLE_RATE:
+            return True
+        
+        pcm = np.frombuffer(memoryview(audio.frame_data), dtype=np.int16)
+        
+        # openwakeword consumes 80 ms frames at 16 kHz
+        frame_size = 1280
+        best = 0.0
+        try:
+            for start in range(0, len(pcm) - frame_size + 1, frame_size):
+                scores = self.wake_model.predict(pcm[start:start + frame_size])
+                best = max(best, max(scores.values(), default=0.0))
+        finally:
+            self.wake_model.reset()
+        
+        if best >= self.config.get("wake_word_score", 0.5):
+            self._wake_until = time.monotonic() + self.config.get("wake_word_window", 8)
+            return True
+        return False
+    
     def register_callback(self, event_type: str, callback: Callable):
         """Register callback for speech events"""
         if event_type not in self.callbacks:
@@ -112,14 +285,28 @@ class SpeechRecognitionSystem:
         self.callbacks[event_type].append(callback)
         self.logger.info(f"Registered callback for {event_type}")
     
+    def unregister_callback(self, event_type: str, callback: Callable):
+        """Remove a previously registered callback"""
+        callbacks = self.callbacks.get(event_type)
+        if not callbacks:
+            return
+        # Rebuild rather than mutate so a dispatch in progress keeps a stable list
+        remaining = [cb for cb in callbacks if cb != callback]
+        if remaining:
+            self.callbacks[event_type] = remaining
+        else:
+            self.callbacks.pop(event_type, None)
+    
     def trigger_callback(self, event_type: str, data: Dict[str, Any]):
         """Trigger callbacks for specific events"""
-        if event_type in self.callbacks:
-            for callback in self.callbacks[event_type]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    self.logger.error(f"Error in {event_type} callback: {e}")
+        callbacks = self.callbacks.get(event_type)
+        if not callbacks:
+            return
+        for callback in callbacks:
+            try:
+                callback(data)
+            except Exception as e:
+                self.logger.error(f"Error in {event_type} callback: {e}")
     
     def start_listening(self):
         """Start continuous speech recognition"""
@@ -132,6 +319,8 @@ class SpeechRecognitionSystem:
             return True
         
         self.is_listening = True
+        self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
+        self.processing_thread.start()
         self.recognition_thread = threading.Thread(target=self._recognition_loop, daemon=True)
         self.recognition_thread.start()
         
@@ -141,32 +330,31 @@ class SpeechRecognitionSystem:
     def stop_listening(self):
         """Stop speech recognition"""
         self.is_listening = False
+        self._audio_event.set()
         if self.recognition_thread:
             self.recognition_thread.join(timeout=2)
+        if self.processing_thread:
+            self.processing_thread.join(timeout=2)
+        self._audio_ring.clear()
         self.logger.info("Stopped speech recognition")
     
     def _recognition_loop(self):
         """Main recognition loop"""
-        import speech_recognition as sr
-        
         while self.is_listening:
             try:
                 # Listen for audio
                 with self.microphone as source:
-                    self.logger.debug("Listening for speech...")
+                    if self._dbg:
+                        self.logger.debug("Listening for speech...")
                     audio = self.recognizer.listen(
                         source, 
-                        timeout=self.config.get("timeout", 5),
-                        phrase_time_limit=self.config.get("phrase_timeout", 0.3)
+                        timeout=self._timeout,
+                        phrase_time_limit=self._phrase_time_limit()
                     )
                 
-                # Process audio in separate thread to avoid blocking
-                processing_thread = threading.Thread(
-                    target=self._process_audio,
-                    args=(audio,),
-                    daemon=True
-                )
-                processing_thread.start()
+                # Hand audio to the processing thread to avoid blocking
+                self._audio_ring.append(audio)
+                self._audio_event.set()
                 
             except sr.WaitTimeoutError:
                 # Normal timeout, continue listening
@@ -175,90 +363,138 @@ class SpeechRecognitionSystem:
                 self.logger.error(f"Recognition loop error: {e}")
                 time.sleep(1)
     
+    def _phrase_time_limit(self) -> float:
+        """Phrase limit for the next listen, tracking recent utterance lengths"""
+        if not self._adaptive_phrase:
+            return self._phrase_timeout
+        return min(self._max_phrase, max(0.5, 1.5 * self._ewma_dur))
+    
+    def _processing_loop(self):
+        """Consume captured audio from the ring buffer"""
+        while self.is_listening:
+            # Woken by new audio, or by stop_listening after it clears is_listening
+            self._audio_event.wait()
+            self._audio_event.clear()
+            while self._audio_ring:
+                self._process_audio(self._audio_ring.popleft())
+    
     def _process_audio(self, audio):
         """Process recognized audio"""
-        import speech_recognition as sr
-        
         try:
             # Try different recognition engines based on config
-            engine = self.config.get("engine", "auto")
-            language = self.config.get("language", "en-US")
+            engine = self._engine
+            language = self._lang
             
             text = None
             confidence = 0.0
             
+            # Resample once and share the buffer between the wake gate and the upload
+            upload_audio = self._downsample_for_upload(audio)
+            if not self._passes_wake_gate(upload_audio):
+                return
+            
             if engine == "google" or engine == "auto":
                 try:
-                    result = self.recognizer.recognize_google(audio, language=language, show_all=True)
+                    result = self.recognizer.recognize_google(
+                        upload_audio, language=language, show_all=True
+                    )
                     if result and 'alternative' in result:
                         text = result['alternative'][0]['transcript']
                         confidence = result['alternative'][0].get('confidence', 0.5)
                 except Exception as e:
-                    self.logger.debug(f"Google recognition failed: {e}")
+                    if self._dbg:
+                        self.logger.debug("Google recognition failed: %s", e)
             
             if not text and (engine == "sphinx" or engine == "auto"):
                 try:
                     text = self.recognizer.recognize_sphinx(audio, language=language)
                     confidence = 0.6  # Default confidence for Sphinx
                 except Exception as e:
-                    self.logger.debug(f"Sphinx recognition failed: {e}")
+                    if self._dbg:
+                        self.logger.debug("Sphinx recognition failed: %s", e)
             
-            if text and confidence >= self.config.get("confidence_threshold", 0.7):
+            if text and confidence >= self._conf_threshold:
+                duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+                self._ewma_dur = 0.9 * self._ewma_dur + 0.1 * duration
                 self.logger.info(f"Recognized: '{text}' (confidence: {confidence:.2f})")
                 self._process_recognized_text(text, confidence)
             else:
-                self.logger.debug("Recognition confidence too low or no text recognized")
+                if self._dbg:
+                    self.logger.debug("Recognition confidence too low or no text recognized")
                 
         except Exception as e:
             self.logger.error(f"Audio processing error: {e}")
     
+    def _downsample_for_upload(self, audio):
+        """Resample 16-bit audio to 16 kHz mono before sending it to a cloud engine"""
+        if not NUMPY_AVAILABLE or audio.sample_width != 2 or audio.sample_rate <= ASR_SAMPLE_RATE:
+            return _upload_audio_data(audio.frame_data, audio.sample_rate, audio.sample_width)
+        
+        pcm = np.frombuffer(memoryview(audio.frame_data), dtype=np.int16)
+        channels = getattr(audio, "channels", 1)
+        if channels > 1:
+            pcm = pcm[:len(pcm) - len(pcm) % channels].reshape(-1, channels).mean(axis=1)
+        
+        ratio, remainder = divmod(audio.sample_rate, ASR_SAMPLE_RATE)
+        if remainder == 0:
+            # Integer ratio: average each block as a cheap anti-aliasing decimator
+            pcm = pcm[:len(pcm) - len(pcm) % ratio].reshape(-1, ratio).mean(axis=1)
+        else:
+            target_len = int(len(pcm) * ASR_SAMPLE_RATE / audio.sample_rate)
+            pcm = np.interp(
+                np.linspace(0, len(pcm) - 1, target_len), np.arange(len(pcm)), pcm
+            )
+        
+        return _upload_audio_data(pcm.astype(np.int16).tobytes(), ASR_SAMPLE_RATE, 2)
+    
     def _process_recognized_text(self, text: str, confidence: float):
         """Process and interpret recognized text"""
+        callbacks = self.callbacks
+        if not callbacks:
+            return
+        
         text_lower = text.lower().strip()
+        now = datetime.now()
         
         # Check for wake words
         if self._check_wake_words(text_lower):
-            self.trigger_callback("wake_word_detected", {
-                "text": text,
-                "confidence": confidence,
-                "timestamp": datetime.now()
-            })
+            if callbacks.get("wake_word_detected"):
+                self.trigger_callback("wake_word_detected", {
+                    "text": text,
+                    "confidence": confidence,
+                    "timestamp": now
+                })
             return
         
         # Classify intent
         intent = self._classify_intent(text_lower)
         
         # Trigger appropriate callback
-        self.trigger_callback("speech_recognized", {
-            "text": text,
-            "confidence": confidence,
-            "intent": intent,
-            "timestamp": datetime.now()
-        })
-        
-        if intent:
-            self.trigger_callback(f"intent_{intent}", {
+        if callbacks.get("speech_recognized"):
+            self.trigger_callback("speech_recognized", {
                 "text": text,
                 "confidence": confidence,
-                "timestamp": datetime.now()
+                "intent": intent,
+                "timestamp": now
+            })
+        
+        intent_event = f"intent_{intent}"
+        if intent and callbacks.get(intent_event):
+            self.trigger_callback(intent_event, {
+                "text": text,
+                "confidence": confidence,
+                "timestamp": now
             })
     
     def _check_wake_words(self, text: str) -> bool:
         """Check if text contains wake words"""
-        wake_words = self.config.get("wake_words", [])
-        for wake_word in wake_words:
-            if wake_word.lower() in text:
-                return True
-        return False
+        return self._wake_pattern is not None and self._wake_pattern.search(text) is not None
     
     def _classify_intent(self, text: str) -> Optional[str]:
         """Classify the intent of recognized text"""
-        commands = self.config.get("commands", {})
-        
-        for intent, keywords in commands.items():
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    return intent
+        for intent, pattern in self._intent_patterns:
+            if pattern.search(text):
+                return intent
         
         return "general"
     
@@ -267,15 +503,13 @@ class SpeechRecognitionSystem:
         if not self.is_enabled:
             return None
         
-        import speech_recognition as sr
-        
         try:
             with self.microphone as source:
                 self.logger.info("Listening for speech...")
                 audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=5)
             
             # Try recognition
-            text = self.recognizer.recognize_google(audio, language=self.config.get("language", "en-US"))
+            text = self.recognizer.recognize_google(audio, language=self._lang)
             
             return {
                 "text": text,
@@ -311,12 +545,13 @@ class SpeechRecognitionSystem:
     def update_configuration(self, new_config: Dict[str, Any]):
         """Update speech recognition configuration"""
         self.config.update(new_config)
+        self._apply_configuration()
         
         # Save updated config
         config_path = "data/speech_config.json"
         try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            with open(config_path, 'wb') as f:
+                f.write(_dumps(self.config))
             self.logger.info("Speech recognition configuration updated")
         except Exception as e:
             self.logger.error(f"Error saving speech config: {e}")
@@ -326,8 +561,6 @@ class SpeechRecognitionSystem:
         if not self.is_enabled:
             return {"available": False, "error": "Speech recognition not enabled"}
         
-        import speech_recognition as sr
-        
         try:
             with self.microphone as source:
                 self.logger.info("Testing microphone - please speak...")
@@ -335,7 +568,7 @@ class SpeechRecognitionSystem:
             
             # Try to recognize the test audio
             try:
-                text = self.recognizer.recognize_google(audio, language=self.config.get("language", "en-US"))
+                text = self.recognizer.recognize_google(audio, language=self._lang)
                 return {
                     "available": True,
                     "test_successful": True,
@@ -5,17 +5,49 @@ Enhanced voice command system with confirmation and timeout handling
 """
 
 import os
-import time
-import threading
+import re
+import sys
+import copy
+import atexit
+import json
+import itertools
 import logging
-from typing import Dict, List, Optional, Callable, Any
+import threading
+from typing import Dict, List, Optional, Callable, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+from functools import cached_property
 from enum import Enum
-from PyQt5.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout
-from PyQt5.QtCore import QTimer, pyqtSignal, Qt
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal, Qt
 from PyQt5.QtGui import QFont, QPixmap
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=4).encode("utf-8")
+
+    def _loads(data: bytes):
+        return json.loads(data)
+
+CONFIG_PATH = "data/voice_confirmation_config.json"
+
+# Parsed config files keyed by path, stored as (mtime, config)
+_CONFIG_CACHE: Dict[str, tuple] = {}
+
+# Splits recognized speech into lowercase-able word tokens
+_WORD_RE = re.compile(r"[\w']+")
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class ConfirmationState(Enum):
     """States for voice confirmation process"""
     IDLE = "idle"
@@ -25,7 +57,7 @@ class ConfirmationState(Enum):
     CANCELLED = "cancelled"
     TIMEOUT = "timeout"
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class VoiceCommand:
     """Voice command with confirmation requirements"""
     id: str
@@ -45,11 +77,58 @@ class VoiceConfirmationTooltip(QWidget):
     command_confirmed = pyqtSignal(str)  # command_id
     command_cancelled = pyqtSignal(str)  # command_id
     
+    # Stylesheet variants, built once instead of rewritten per event
+    _STYLE_NORMAL = """
+        QWidget {
+            background-color: rgba(45, 45, 45, 240);
+            border-radius: 12px;
+            border: 2px solid rgba(74, 144, 226, 180);
+        }
+        QLabel {
+            color: white;
+            background: transparent;
+            border: none;
+        }
+        QPushButton {
+            background-color: rgba(74, 144, 226, 200);
+            color: white;
+            border: none;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: bold;
+            font-size: 12px;
+        }
+        QPushButton:hover {
+            background-color: rgba(74, 144, 226, 255);
+        }
+        QPushButton:pressed {
+            background-color: rgba(53, 122, 189, 255);
+        }
+        #cancelButton {
+            background-color: rgba(220, 53, 69, 200);
+        }
+        #cancelButton:hover {
+            background-color: rgba(220, 53, 69, 255);
+        }
+    """
+    _STYLE_TIMEOUT = _STYLE_NORMAL.replace(
+        "border: 2px solid rgba(74, 144, 226, 180);",
+        "border: 2px solid rgba(255, 193, 7, 200);"
+    )
+    _STYLE_FLASH = _STYLE_TIMEOUT.replace(
+        "background-color: rgba(45, 45, 45, 240);",
+        "background-color: rgba(255, 193, 7, 240);"
+    )
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_command = None
         self.timeout_timer = QTimer()
         self.timeout_timer.timeout.connect(self.on_timeout)
+        self._remaining = 0
+        self._active_style = None
+        self._center = None
+        self._watching_screen = False
         self.init_ui()
     
     def init_ui(self):
@@ -65,39 +144,7 @@ class VoiceConfirmationTooltip(QWidget):
         layout.setSpacing(10)
         
         # Background with rounded corners
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(45, 45, 45, 240);
-                border-radius: 12px;
-                border: 2px solid rgba(74, 144, 226, 180);
-            }
-            QLabel {
-                color: white;
-                background: transparent;
-                border: none;
-            }
-            QPushButton {
-                background-color: rgba(74, 144, 226, 200);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: bold;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: rgba(74, 144, 226, 255);
-            }
-            QPushButton:pressed {
-                background-color: rgba(53, 122, 189, 255);
-            }
-            #cancelButton {
-                background-color: rgba(220, 53, 69, 200);
-            }
-            #cancelButton:hover {
-                background-color: rgba(220, 53, 69, 255);
-            }
-        """)
+        self._apply_style(self._STYLE_NORMAL)
         
         # Header
         self.header_label = QLabel("🎤 Voice Command Detected")
@@ -137,6 +184,11 @@ class VoiceConfirmationTooltip(QWidget):
         layout.addLayout(button_layout)
         self.setLayout(layout)
         
+        # Single repeating timer drives the header countdown
+        self._countdown_timer = QTimer(self)
+        self._countdown_timer.setInterval(1000)
+        self._countdown_timer.timeout.connect(self._tick_countdown)
+        
         # Initially hidden
         self.hide()
     
@@ -144,16 +196,19 @@ class VoiceConfirmationTooltip(QWidget):
         """Show confirmation tooltip for a voice command"""
         self.current_command = command
         
+        # Batch text, style and geometry changes into a single repaint
+        self.setUpdatesEnabled(False)
+        
         # Update UI
         self.command_label.setText(f"'{command.command_text}'\n{command.preview_text}")
+        self._apply_style(self._STYLE_NORMAL)
+        self._remaining = command.timeout_seconds
+        self.update_countdown()
         
         # Position tooltip (center of screen)
-        from PyQt5.QtWidgets import QDesktopWidget
-        desktop = QDesktopWidget()
-        screen_rect = desktop.screenGeometry()
-        x = (screen_rect.width() - self.width()) // 2
-        y = (screen_rect.height() - self.height()) // 2
-        self.move(x, y)
+        self.move(*self._screen_center())
+        
+        self.setUpdatesEnabled(True)
         
         # Show tooltip
         self.show()
@@ -161,26 +216,45 @@ class VoiceConfirmationTooltip(QWidget):
         self.activateWindow()
         self.submit_button.setFocus()
         
-        # Start timeout timer
+        # Start timeout timer and header countdown
         self.timeout_timer.start(command.timeout_seconds * 1000)
-        
-        # Update header with countdown
-        self.update_countdown()
+        self._countdown_timer.start()
+    
+    def _screen_center(self):
+        """Top-left position that centers the tooltip, cached until the screen changes"""
+        if self._center is None:
+            screen = QApplication.primaryScreen()
+            screen_rect = screen.geometry()
+            self._center = (
+                (screen_rect.width() - self.width()) // 2,
+                (screen_rect.height() - self.height()) // 2
+            )
+            if not self._watching_screen:
+                screen.geometryChanged.connect(self._invalidate_center)
+                self._watching_screen = True
+        return self._center
+    
+    def _invalidate_center(self, *args):
+        """Recompute the centered position on the next show"""
+        self._center = None
     
     def update_countdown(self):
         """Update header with countdown timer"""
-        if self.timeout_timer.isActive():
-            remaining = self.timeout_timer.remainingTime() // 1000
-            self.header_label.setText(f"🎤 Voice Command Detected ({remaining}s)")
-            
-            # Schedule next update
-            if remaining > 0:
-                QTimer.singleShot(1000, self.update_countdown)
+        self.header_label.setText(f"🎤 Voice Command Detected ({self._remaining}s)")
+    
+    def _tick_countdown(self):
+        """Advance the countdown by one second"""
+        self._remaining -= 1
+        if self._remaining <= 0 or not self.timeout_timer.isActive():
+            self._countdown_timer.stop()
+            return
+        self.update_countdown()
     
     def confirm_command(self):
         """Confirm the current command"""
         if self.current_command:
             self.timeout_timer.stop()
+            self._countdown_timer.stop()
             self.command_confirmed.emit(self.current_command.id)
             self.hide()
             self.current_command = None
@@ -189,6 +263,7 @@ class VoiceConfirmationTooltip(QWidget):
         """Cancel the current command"""
         if self.current_command:
             self.timeout_timer.stop()
+            self._countdown_timer.stop()
             self.command_cancelled.emit(self.current_command.id)
             self.hide()
             self.current_command = None
@@ -196,31 +271,44 @@ class VoiceConfirmationTooltip(QWidget):
     def on_timeout(self):
         """Handle timeout - ask user for decision"""
         self.timeout_timer.stop()
+        self._countdown_timer.stop()
         
         # Change appearance to highlight timeout
+        self.setUpdatesEnabled(False)
         self.header_label.setText("⏰ Command Timeout - Submit or Cancel?")
-        self.setStyleSheet(self.styleSheet().replace(
-            "border: 2px solid rgba(74, 144, 226, 180);",
-            "border: 2px solid rgba(255, 193, 7, 200);"
-        ))
+        self._apply_style(self._STYLE_TIMEOUT)
+        self.setUpdatesEnabled(True)
         
         # Flash effect
         self.flash_tooltip()
     
     def flash_tooltip(self):
         """Flash the tooltip to get attention"""
-        original_style = self.styleSheet()
-        flash_style = original_style.replace(
-            "background-color: rgba(45, 45, 45, 240);",
-            "background-color: rgba(255, 193, 7, 240);"
-        )
-        
-        self.setStyleSheet(flash_style)
-        QTimer.singleShot(200, lambda: self.setStyleSheet(original_style))
+        self._apply_style(self._STYLE_FLASH)
+        QTimer.singleShot(200, self._restore_style)
+    
+    def _restore_style(self):
+        """Return from the flash highlight to the timeout style"""
+        self._apply_style(self._STYLE_TIMEOUT)
+    
+    def _apply_style(self, style: str):
+        """Set the stylesheet only when it differs from the active one"""
+        if style is not self._active_style:
+            self._active_style = style
+            self.setStyleSheet(style)
+
+class _ConfirmationBridge(QObject):
+    """Marshals speech recognition callbacks onto the Qt main thread"""
+    
+    voice_confirmed = pyqtSignal(str)  # command_id
+    voice_cancelled = pyqtSignal(str)  # command_id
 
 class VoiceConfirmationSystem:
     """Enhanced voice command system with confirmation"""
     
+    # Shared across instances so command IDs never collide
+    _id_counter = itertools.count(1)
+    
     def __init__(self, voice_system=None, speech_recognition=None):
         self.logger = logging.getLogger(__name__)
         self.voice_system = voice_system
@@ -228,25 +316,52 @@ class VoiceConfirmationSystem:
         
         # State management
         self.state = ConfirmationState.IDLE
-        self.pending_commands: Dict[str, VoiceCommand] = {}
-        self.confirmation_callbacks: Dict[str, Callable] = {}
-        
-        # UI components
-        self.confirmation_tooltip = VoiceConfirmationTooltip()
-        self.confirmation_tooltip.command_confirmed.connect(self.on_command_confirmed)
-        self.confirmation_tooltip.command_cancelled.connect(self.on_command_cancelled)
+        self._pending: Dict[str, Tuple[VoiceCommand, Callable]] = {}
+        # Guards _pending and the listening claim against the speech thread
+        self._pending_lock = threading.Lock()
         
         # Configuration
         self.config = self.load_configuration()
+        self._config_dirty = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(500)
+        self._flush_timer.timeout.connect(self._flush_config)
+        
+        # A change made just before exit must not wait on a timer that never fires
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._flush_config)
+        atexit.register(self._flush_config)
         
         # Voice confirmation listening
         self.listening_for_submit = False
-        self.submit_keywords = ["submit", "execute", "confirm", "yes", "do it"]
-        self.cancel_keywords = ["cancel", "stop", "no", "abort", "nevermind"]
+        self._listening_command_id = None
+        self._listener_registered = False
+        self._bridge = _ConfirmationBridge()
+        self._bridge.voice_confirmed.connect(self.on_voice_confirmed)
+        self._bridge.voice_cancelled.connect(self.on_voice_cancelled)
+        self._listen_timer = QTimer()
+        self._listen_timer.setSingleShot(True)
+        self._listen_timer.timeout.connect(self._on_listen_timeout)
+        self._compile_keywords()
+    
+    @cached_property
+    def confirmation_tooltip(self) -> VoiceConfirmationTooltip:
+        """Confirmation tooltip, built on first use so no widget exists before it is needed"""
+        tooltip = VoiceConfirmationTooltip()
+        tooltip.command_confirmed.connect(self.on_command_confirmed)
+        tooltip.command_cancelled.connect(self.on_command_cancelled)
+        return tooltip
+    
+    def _hide_tooltip(self):
+        """Hide the tooltip if it has been created"""
+        if "confirmation_tooltip" in self.__dict__:
+            self.confirmation_tooltip.hide()
     
     def load_configuration(self) -> Dict[str, Any]:
         """Load voice confirmation configuration"""
-        config_path = "data/voice_confirmation_config.json"
+        config_path = CONFIG_PATH
         default_config = {
             "confirmation_required": True,
             "timeout_seconds": 10,
@@ -262,25 +377,57 @@ class VoiceConfirmationSystem:
         
         try:
             if os.path.exists(config_path):
-                with open(config_path, 'r') as f:
-                    loaded_config = json.load(f)
-                    default_config.update(loaded_config)
+                mtime = os.stat(config_path).st_mtime
+                cached = _CONFIG_CACHE.get(config_path)
+                if cached is not None and cached[0] == mtime:
+                    loaded_config = cached[1]
+                else:
+                    with open(config_path, 'rb') as f:
+                        loaded_config = _loads(f.read())
+                    _CONFIG_CACHE[config_path] = (mtime, loaded_config)
+                default_config.update(copy.deepcopy(loaded_config))
             else:
                 os.makedirs("data", exist_ok=True)
-                with open(config_path, 'w') as f:
-                    json.dump(default_config, f, indent=4)
+                with open(config_path, 'wb') as f:
+                    f.write(_dumps(default_config))
         except Exception as e:
-            self.logger.error(f"Error loading voice confirmation config: {e}")
+            self.logger.error("Error loading voice confirmation config: %s", e)
         
         return default_config
     
+    def _compile_keywords(self):
+        """Precompile submit/cancel keyword patterns from the config"""
+        self.submit_keywords = self.config.get("submit_keywords", [])
+        self.cancel_keywords = self.config.get("cancel_keywords", [])
+        
+        def build(keywords):
+            # Single words match by set intersection; phrases fall back to a regex
+            keywords = [k.lower() for k in keywords if k]
+            words = frozenset(k for k in keywords if _WORD_RE.fullmatch(k))
+            phrases = [k for k in keywords if k not in words]
+            phrase_re = None
+            if phrases:
+                alternatives = "|".join(re.escape(p) for p in phrases)
+                phrase_re = re.compile(r"\b(?:" + alternatives + r")\b", re.IGNORECASE)
+            return words, phrase_re
+        
+        self._submit_words, self._submit_re = build(self.submit_keywords)
+        self._cancel_words, self._cancel_re = build(self.cancel_keywords)
+    
+    @staticmethod
+    def _matches_keywords(text: str, tokens: frozenset, words: frozenset, phrase_re) -> bool:
+        """Check tokenized speech against single-word keywords, then phrases"""
+        if tokens & words:
+            return True
+        return phrase_re is not None and phrase_re.search(text) is not None
+    
     def process_voice_command(self, command_text: str, intent: str, 
                             parameters: Dict[str, Any], confidence: float,
                             callback: Callable, preview_text: str = "") -> str:
         """Process a voice command with confirmation"""
         
         # Generate unique command ID
-        command_id = f"cmd_{int(time.time() * 1000)}"
+        command_id = f"cmd_{next(self._id_counter)}"
         
         # Create command object
         command = VoiceCommand(
@@ -296,8 +443,8 @@ class VoiceConfirmationSystem:
         )
         
         # Store command and callback
-        self.pending_commands[command_id] = command
-        self.confirmation_callbacks[command_id] = callback
+        with self._pending_lock:
+            self._pending[command_id] = (command, callback)
         
         # If confirmation not required, execute immediately
         if not command.requires_confirmation:
@@ -325,91 +472,98 @@ class VoiceConfirmationSystem:
             self.confirmation_tooltip.show_confirmation(command)
         
         self.state = ConfirmationState.PENDING_CONFIRMATION
-        self.logger.info(f"Showing confirmation for command: {command.command_text}")
+        self.logger.info("Showing confirmation for command: %s", command.command_text)
     
     def start_voice_confirmation_listening(self, command_id: str):
         """Start listening for voice confirmation keywords"""
-        self.listening_for_submit = True
-        
-        # Start a separate thread to listen for confirmation
-        threading.Thread(
-            target=self._voice_confirmation_listener,
-            args=(command_id,),
-            daemon=True
-        ).start()
-    
-    def _voice_confirmation_listener(self, command_id: str):
-        """Listen for voice confirmation in separate thread"""
         if not self.speech_recognition or not self.speech_recognition.is_enabled:
             return
         
-        timeout = self.config.get("timeout_seconds", 10)
-        start_time = time.time()
+        with self._pending_lock:
+            self.listening_for_submit = True
+            self._listening_command_id = command_id
         
-        while (self.listening_for_submit and 
-               command_id in self.pending_commands and
-               time.time() - start_time < timeout):
-            
-            try:
-                # Listen for speech
-                text = self.speech_recognition.listen_once(timeout=2)
-                if text:
-                    text_lower = text.lower()
-                    
-                    # Check for submit keywords
-                    if any(keyword in text_lower for keyword in self.submit_keywords):
-                        self.listening_for_submit = False
-                        self.on_voice_confirmed(command_id)
-                        return
-                    
-                    # Check for cancel keywords
-                    elif any(keyword in text_lower for keyword in self.cancel_keywords):
-                        self.listening_for_submit = False
-                        self.on_voice_cancelled(command_id)
-                        return
-                
-            except Exception as e:
-                self.logger.debug(f"Voice confirmation listening error: {e}")
-                time.sleep(0.5)
+        # Recognized speech is pushed to us; no polling thread needed
+        if not self._listener_registered:
+            self.speech_recognition.register_callback("speech_recognized", self._on_stt_text)
+            self._listener_registered = True
         
-        # Timeout reached
-        self.listening_for_submit = False
-        if command_id in self.pending_commands:
+        self._listen_timer.start(self.config.get("timeout_seconds", 10) * 1000)
+    
+    def stop_voice_confirmation_listening(self):
+        """Stop listening for voice confirmation keywords"""
+        with self._pending_lock:
+            self.listening_for_submit = False
+            self._listening_command_id = None
+        self._listen_timer.stop()
+        
+        if self._listener_registered:
+            self.speech_recognition.unregister_callback("speech_recognized", self._on_stt_text)
+            self._listener_registered = False
+    
+    def _on_stt_text(self, data: Dict[str, Any]):
+        """Match recognized speech against confirmation keywords (speech thread)"""
+        text = data.get("text", "")
+        tokens = frozenset(_WORD_RE.findall(text.lower()))
+        
+        # Check for submit keywords, then cancel keywords
+        if self._matches_keywords(text, tokens, self._submit_words, self._submit_re):
+            signal = self._bridge.voice_confirmed
+        elif self._matches_keywords(text, tokens, self._cancel_words, self._cancel_re):
+            signal = self._bridge.voice_cancelled
+        else:
+            return
+        
+        with self._pending_lock:
+            command_id = self._listening_command_id
+            if not self.listening_for_submit or command_id not in self._pending:
+                return
+            self.listening_for_submit = False
+        
+        signal.emit(command_id)
+    
+    def _on_listen_timeout(self):
+        """Handle the voice confirmation window expiring"""
+        command_id = self._listening_command_id
+        self.stop_voice_confirmation_listening()
+        if command_id in self._pending:
             self.on_confirmation_timeout(command_id)
     
     def on_voice_confirmed(self, command_id: str):
         """Handle voice confirmation"""
-        self.logger.info(f"Voice confirmation received for command: {command_id}")
+        self.stop_voice_confirmation_listening()
+        self.logger.info("Voice confirmation received for command: %s", command_id)
         
         if self.voice_system:
             self.voice_system.speak_async("Command confirmed, executing now")
         
         self.execute_command(command_id)
-        self.confirmation_tooltip.hide()
+        self._hide_tooltip()
     
     def on_voice_cancelled(self, command_id: str):
         """Handle voice cancellation"""
-        self.logger.info(f"Voice cancellation received for command: {command_id}")
+        self.stop_voice_confirmation_listening()
+        self.logger.info("Voice cancellation received for command: %s", command_id)
         
         if self.voice_system:
             self.voice_system.speak_async("Command cancelled")
         
         self.cancel_command(command_id)
-        self.confirmation_tooltip.hide()
+        self._hide_tooltip()
     
     def on_command_confirmed(self, command_id: str):
         """Handle UI confirmation button click"""
-        self.listening_for_submit = False
+        self.stop_voice_confirmation_listening()
         self.execute_command(command_id)
     
     def on_command_cancelled(self, command_id: str):
         """Handle UI cancellation button click"""
-        self.listening_for_submit = False
+        self.stop_voice_confirmation_listening()
         self.cancel_command(command_id)
     
     def on_confirmation_timeout(self, command_id: str):
         """Handle confirmation timeout"""
-        self.logger.info(f"Confirmation timeout for command: {command_id}")
+        self.logger.info("Confirmation timeout for command: %s", command_id)
         
         if self.voice_system:
             timeout_prompt = self.config.get("timeout_prompt", 
@@ -417,7 +571,7 @@ class VoiceConfirmationSystem:
             self.voice_system.speak_async(timeout_prompt)
         
         # Keep the tooltip visible but update it
-        if command_id in self.pending_commands:
+        if command_id in self._pending:
             self.confirmation_tooltip.on_timeout()
             
             # Extended listening for final decision
@@ -425,11 +579,12 @@ class VoiceConfirmationSystem:
     
     def execute_command(self, command_id: str):
         """Execute a confirmed command"""
-        if command_id in self.pending_commands and command_id in self.confirmation_callbacks:
-            command = self.pending_commands[command_id]
-            callback = self.confirmation_callbacks[command_id]
+        with self._pending_lock:
+            entry = self._pending.get(command_id)
+        if entry is not None:
+            command, callback = entry
             
-            self.logger.info(f"Executing confirmed command: {command.command_text}")
+            self.logger.info("Executing confirmed command: %s", command.command_text)
             
             try:
                 # Execute the callback
@@ -437,7 +592,7 @@ class VoiceConfirmationSystem:
                 self.state = ConfirmationState.CONFIRMED
                 
             except Exception as e:
-                self.logger.error(f"Error executing command: {e}")
+                self.logger.error("Error executing command: %s", e)
                 if self.voice_system:
                     self.voice_system.speak_async("Sorry, there was an error executing the command")
             
@@ -446,29 +601,38 @@ class VoiceConfirmationSystem:
     
     def cancel_command(self, command_id: str):
         """Cancel a pending command"""
-        if command_id in self.pending_commands:
-            command = self.pending_commands[command_id]
-            self.logger.info(f"Cancelling command: {command.command_text}")
+        with self._pending_lock:
+            entry = self._pending.get(command_id)
+        if entry is not None:
+            command = entry[0]
+            self.logger.info("Cancelling command: %s", command.command_text)
             self.state = ConfirmationState.CANCELLED
             self.cleanup_command(command_id)
     
     def cleanup_command(self, command_id: str):
         """Clean up command resources"""
-        self.pending_commands.pop(command_id, None)
-        self.confirmation_callbacks.pop(command_id, None)
+        if command_id == self._listening_command_id:
+            self.stop_voice_confirmation_listening()
+        with self._pending_lock:
+            self._pending.pop(command_id, None)
         self.state = ConfirmationState.IDLE
     
     def get_pending_commands(self) -> List[VoiceCommand]:
         """Get list of pending commands"""
-        return list(self.pending_commands.values())
+        with self._pending_lock:
+            return [command for command, _ in self._pending.values()]
     
     def cancel_all_pending(self):
         """Cancel all pending commands"""
-        for command_id in list(self.pending_commands.keys()):
-            self.cancel_command(command_id)
+        with self._pending_lock:
+            cancelled = len(self._pending)
+            self._pending.clear()
+        self.state = ConfirmationState.IDLE
+        if cancelled:
+            self.logger.info("Cancelled %d pending commands", cancelled)
         
-        self.confirmation_tooltip.hide()
-        self.listening_for_submit = False
+        self._hide_tooltip()
+        self.stop_voice_confirmation_listening()
     
     def is_waiting_for_confirmation(self) -> bool:
         """Check if system is waiting for confirmation"""
@@ -479,14 +643,40 @@ class VoiceConfirmationSystem:
         for key, value in kwargs.items():
             if key in self.config:
                 self.config[key] = value
+        self._compile_keywords()
+        
+        self._config_dirty = True
+        
+        # Without a Qt application the timer never fires, so write now
+        if QCoreApplication.instance() is None:
+            self._flush_config()
+            return
         
-        # Save updated configuration
-        config_path = "data/voice_confirmation_config.json"
+        # Coalesce rapid updates into a single write
+        self._flush_timer.start()
+    
+    def _flush_config(self):
+        """Persist the configuration if it changed since the last write"""
+        if not self._config_dirty:
+            return
+        self._config_dirty = False
+        
+        config_path = CONFIG_PATH
+        tmp_path = config_path + ".tmp"
         try:
-            with open(config_path, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps(self.config))
+            os.replace(tmp_path, config_path)
+            _CONFIG_CACHE[config_path] = (os.stat(config_path).st_mtime, copy.deepcopy(self.config))
         except Exception as e:
-            self.logger.error(f"Error saving voice confirmation config: {e}")
+            self.logger.error("Error saving voice confirmation config: %s", e)
+
+# Global voice confirmation system instance, created on first request
+_voice_confirmation_system: Optional[VoiceConfirmationSystem] = None
 
-# Global voice confirmation system instance
-voice_confirmation_system = VoiceConfirmationSystem()
\ No newline at end of file
+def get_voice_confirmation_system() -> VoiceConfirmationSystem:
+    """Return the shared voice confirmation system, creating it on first use"""
+    global _voice_confirmation_system
+    if _voice_confirmation_system is None:
+        _voice_confirmation_system = VoiceConfirmationSystem()
+    return _voice_confirmation_system
@@ -1,15 +1,106 @@
 import sys
 import threading
-import queue
+import time
 import logging
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import json
 import os
+import re
+import hashlib
+import shutil
+import subprocess
+import string
+from collections import OrderedDict, deque
+
+# libespeak-ng constants (speak_lib.h)
+ESPEAK_AUDIO_OUTPUT_PLAYBACK = 0
+ESPEAK_RATE = 1
+ESPEAK_POS_CHARACTER = 1
+ESPEAK_CHARS_UTF8 = 1
+
+# Printed by the persistent festival interpreter after each utterance
+FESTIVAL_DONE = "__tts_done__"
+
+# ASCII characters kept when preparing text for speech
+_SPEECH_ALLOWED_CHARS = frozenset(string.ascii_letters + string.digits + string.whitespace + "_.!?,-:;")
 
 class VoiceNotificationSystem:
     """Text-to-speech voice notification system for the AI Avatar Assistant"""
     
+    # Voice name/id keywords per preferred gender, bounded so 'male' does not match 'female'
+    _GENDER_VOICE_RE = {
+        "female": re.compile(r'(?<![a-z])(?:female|woman|zira|hazel|susan)(?![a-z])', re.IGNORECASE),
+        "male": re.compile(r'(?<![a-z])(?:male|man|david|mark|alex)(?![a-z])', re.IGNORECASE)
+    }
+    
+    # Voice names reported as female by get_available_voices
+    _FEMALE_NAME_RE = re.compile(r'female|woman', re.IGNORECASE)
+    
+    # Maximum queued notifications combined into one speech pass
+    MAX_SPEECH_BATCH = 8
+    
+    # Pending speech requests kept before the least urgent are dropped
+    MAX_PENDING_SPEECH = 32
+    
+    # Longest text worth caching as audio; short fixed phrases are what repeat
+    AUDIO_CACHE_MAX_CHARS = 80
+    
+    # Window for collecting task notifications into one utterance (seconds)
+    TASK_NOTIFICATION_WINDOW = 0.2
+    
+    # Spoken messages for task notification types
+    _TASK_TEMPLATES = {
+        "deadline_soon": "Attention: The task '{}' is due soon.",
+        "deadline_now": "Alert: The task '{}' deadline has arrived.",
+        "completed": "Great job! Task '{}' has been completed.",
+        "overdue": "Warning: The task '{}' is overdue.",
+        "reminder": "Reminder: Don't forget about the task '{}'.",
+        "focus_start": "Starting focus session for '{}'. Good luck!",
+        "focus_complete": "Focus session completed for '{}'. Time for a break!"
+    }
+    _URGENT_TASK_TYPES = frozenset({"deadline_now", "overdue"})
+    
+    # Urgency levels, mapped to personas and ranked for bulk notifications
+    _PERSONA_MAP = {
+        "low": "calm",
+        "normal": "normal",
+        "high": "friendly",
+        "urgent": "urgent",
+        "critical": "urgent"
+    }
+    _URGENCY_ORDER = {"low": 0, "normal": 1, "high": 2, "urgent": 3, "critical": 4}
+    
+    # Text cleanup tables used by prepare_text_for_speech
+    _DELETE_TABLE = str.maketrans('', '', ''.join(
+        chr(c) for c in range(128) if chr(c) not in _SPEECH_ALLOWED_CHARS
+    ))
+    _REPLACEMENTS = {
+        '&': 'and',
+        '@': 'at',
+        '#': 'number',
+        '%': 'percent',
+        '$': 'dollars',
+        '€': 'euros',
+        '£': 'pounds',
+        '...': ' ',
+        '--': ' ',
+        'AI': 'A I',
+        'API': 'A P I',
+        'URL': 'U R L',
+        'UI': 'U I',
+        'UX': 'U X'
+    }
+    # Longest keys first so e.g. 'API' wins over any shorter overlapping key
+    _REPLACEMENTS_RE = re.compile('|'.join(
+        re.escape(key) for key in sorted(_REPLACEMENTS, key=len, reverse=True)
+    ))
+    
+    @classmethod
+    def _replace_match(cls, match):
+        return cls._REPLACEMENTS[match.group(0)]
+    
     def __init__(self, config_path="data/config.json"):
+        self.config_path = config_path
         self.config = self.load_config(config_path)
         self.voice_config = self.config.get("voice", {})
         self.logger = logging.getLogger(__name__)
@@ -24,12 +115,42 @@ class VoiceNotificationSystem:
         # TTS engine
         self.tts_engine = None
         self.is_initialized = False
-        
-        # Speech queue for managing multiple notifications
-        self.speech_queue = queue.Queue()
-        self.is_speaking = False
+        self._voices_cache = None
+        self._available_voices_cache = None
+        self._selected_voice = None  # (gender, voice id)
+        self._last_applied_rate = None
+        self._last_applied_volume = None
+        
+        # Speech queue for managing multiple notifications; the condition guards
+        # both the pending requests and the worker's stop flag
+        self._speech_pending = deque()
+        self._speech_cond = threading.Condition()
+        self._speech_stopping = False
+        self._speaking_event = threading.Event()
         self.speech_thread = None
         
+        # Task notifications buffered for TASK_NOTIFICATION_WINDOW before speaking
+        self._task_buffer = []
+        self._task_buffer_lock = threading.Lock()
+        self._task_flush_timer = None
+        
+        # Long-lived TTS processes (piper, festival) keyed by (backend, None)
+        self._tts_procs = {}
+        self._espeak_lib = None
+        
+        # Synthesized audio files reused for repeated (text, persona) pairs; opt-in
+        self._audio_cache_enabled = self.voice_config.get("audio_cache", False)
+        self._audio_cache_size = self.voice_config.get("audio_cache_size", 200)
+        self._audio_cache_dir = "data/tts_cache"
+        self._audio_cache = OrderedDict()
+        self._audio_player = self._find_audio_player()
+        self._load_audio_cache_index()
+        
+        # Debounced config writes; the in-memory config is the source of truth
+        self._config_dirty = threading.Event()
+        self._config_lock = threading.Lock()
+        self._config_writer = None
+        
         # Voice personas for different notification types
         self.voice_personas = {
             "urgent": {"rate": 250, "emphasis": "strong"},
@@ -38,7 +159,9 @@ class VoiceNotificationSystem:
             "friendly": {"rate": 190, "emphasis": "cheerful"}
         }
         
-        self.initialize_tts()
+        # The TTS engine is loaded on first use so startup doesn't pay for it
+        self._init_pending = True
+        self._init_lock = threading.Lock()
     
     def load_config(self, config_path):
         """Load configuration"""
@@ -59,6 +182,10 @@ class VoiceNotificationSystem:
             import pyttsx3
             
             self.tts_engine = pyttsx3.init()
+            self._voices_cache = None
+            self._available_voices_cache = None
+            self._last_applied_rate = None
+            self._last_applied_volume = None
             
             # Configure voice properties
             self.configure_voice()
@@ -78,6 +205,15 @@ class VoiceNotificationSystem:
             self.logger.error(f"Failed to initialize TTS engine: {e}")
             return False
     
+    def _ensure_initialized(self):
+        """Initialize the TTS engine on first use"""
+        if self._init_pending:
+            with self._init_lock:
+                if self._init_pending:
+                    self.initialize_tts()
+                    self._init_pending = False
+        return self.is_initialized
+    
     def initialize_platform_tts(self):
         """Initialize platform-specific TTS as fallback"""
         try:
@@ -108,11 +244,8 @@ class VoiceNotificationSystem:
     def initialize_macos_tts(self):
         """Initialize macOS TTS"""
         try:
-            import subprocess
-            
             # Test if 'say' command is available
-            result = subprocess.run(['which', 'say'], capture_output=True, text=True)
-            if result.returncode == 0:
+            if shutil.which('say'):
                 self.platform_tts = "macos"
                 self.is_initialized = True
                 self.logger.info("Voice notification system initialized with macOS say")
@@ -123,21 +256,23 @@ class VoiceNotificationSystem:
         return False
     
     def initialize_linux_tts(self):
-        """Initialize Linux TTS (espeak/festival)"""
+        """Initialize Linux TTS (piper/espeak/festival)"""
+        if self.initialize_piper_tts():
+            return True
+        
+        if self.initialize_espeak_library():
+            return True
+        
         try:
-            import subprocess
-            
             # Try espeak first
-            result = subprocess.run(['which', 'espeak'], capture_output=True, text=True)
-            if result.returncode == 0:
+            if shutil.which('espeak'):
                 self.platform_tts = "linux_espeak"
                 self.is_initialized = True
                 self.logger.info("Voice notification system initialized with espeak")
                 return True
             
             # Try festival as fallback
-            result = subprocess.run(['which', 'festival'], capture_output=True, text=True)
-            if result.returncode == 0:
+            if shutil.which('festival'):
                 self.platform_tts = "linux_festival"
                 self.is_initialized = True
                 self.logger.info("Voice notification system initialized with festival")
@@ -148,6 +283,81 @@ class VoiceNotificationSystem:
         
         return False
     
+    def initialize_piper_tts(self):
+        """Initialize Piper neural TTS if the binary and an ONNX voice model are present"""
+        try:
+            import glob
+            
+            if not shutil.which('piper') or self._audio_player is None:
+                return False
+            
+            model_path = self.voice_config.get("piper_model")
+            if not model_path:
+                models = sorted(glob.glob(os.path.join("data", "models", "*.onnx")))
+                model_path = models[0] if models else None
+            if not model_path or not os.path.exists(model_path):
+                return False
+            
+            self._piper_model = model_path
+            self._piper_output_dir = os.path.join(self._audio_cache_dir, "piper")
+            os.makedirs(self._piper_output_dir, exist_ok=True)
+            
+            self._get_piper_process()
+            
+            self.platform_tts = "linux_piper"
+            self.is_initialized = True
+            self.logger.info(f"Voice notification system initialized with piper ({model_path})")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Piper TTS not available: {e}")
+            return False
+    
+    def _get_piper_process(self):
+        """Return the persistent piper process, starting it if needed"""
+        process = self._tts_procs.get(("piper", None))
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                ['piper', '--model', self._piper_model,
+                 '--output_dir', self._piper_output_dir, '--json-input'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            self._tts_procs[("piper", None)] = process
+        return process
+    
+    def initialize_espeak_library(self):
+        """Load libespeak-ng in-process so the engine is initialized only once"""
+        try:
+            import ctypes
+            import ctypes.util
+            
+            lib_path = ctypes.util.find_library("espeak-ng")
+            if not lib_path:
+                return False
+            
+            lib = ctypes.CDLL(lib_path)
+            lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+            lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+            lib.espeak_Synth.argtypes = [
+                ctypes.c_char_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                ctypes.c_uint, ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p
+            ]
+            
+            if lib.espeak_Initialize(ESPEAK_AUDIO_OUTPUT_PLAYBACK, 500, None, 0) < 0:
+                return False
+            
+            self._espeak_lib = lib
+            self.platform_tts = "linux_espeak_ctypes"
+            self.is_initialized = True
+            self.logger.info("Voice notification system initialized with libespeak-ng")
+            return True
+        except Exception as e:
+            self.logger.warning(f"libespeak-ng not available: {e}")
+            return False
+    
     def configure_voice(self):
         """Configure voice properties for pyttsx3"""
         if not self.tts_engine or not hasattr(self.tts_engine, 'setProperty'):
@@ -155,74 +365,102 @@ class VoiceNotificationSystem:
         
         try:
             # Set speech rate
-            self.tts_engine.setProperty('rate', self.voice_rate)
+            self._set_rate(self.voice_rate)
             
             # Set volume
-            self.tts_engine.setProperty('volume', self.voice_volume)
+            self._set_volume(self.voice_volume)
             
-            # Set voice (try to find preferred gender)
-            voices = self.tts_engine.getProperty('voices')
-            if voices:
-                preferred_voice = None
-                
-                # Look for voice matching preferred gender
-                for voice in voices:
-                    voice_name = voice.name.lower()
-                    voice_id = voice.id.lower()
-                    
-                    if self.voice_gender == "female":
-                        if any(keyword in voice_name or keyword in voice_id 
-                              for keyword in ['female', 'woman', 'zira', 'hazel', 'susan']):
-                            preferred_voice = voice.id
-                            break
-                    else:  # male
-                        if any(keyword in voice_name or keyword in voice_id 
-                              for keyword in ['male', 'man', 'david', 'mark', 'alex']):
-                            preferred_voice = voice.id
-                            break
-                
-                if preferred_voice:
-                    self.tts_engine.setProperty('voice', preferred_voice)
-                elif voices:
-                    # Use first available voice as fallback
-                    self.tts_engine.setProperty('voice', voices[0].id)
+            # Set voice (try to find preferred gender), scanning voices only once
+            if self._selected_voice is None or self._selected_voice[0] != self.voice_gender:
+                voices = self._get_system_voices()
+                if voices:
+                    pattern = self._GENDER_VOICE_RE.get(self.voice_gender, self._GENDER_VOICE_RE["male"])
+                    preferred_voice = next(
+                        (voice.id for voice in voices if pattern.search(f"{voice.name} {voice.id}")),
+                        voices[0].id  # Use first available voice as fallback
+                    )
+                    self._selected_voice = (self.voice_gender, preferred_voice)
+            
+            if self._selected_voice is not None:
+                self.tts_engine.setProperty('voice', self._selected_voice[1])
             
             self.logger.info(f"Voice configured: rate={self.voice_rate}, volume={self.voice_volume}")
             
         except Exception as e:
             self.logger.warning(f"Failed to configure voice properties: {e}")
     
+    def _set_rate(self, rate):
+        """Set the engine rate, skipping the call if it is already applied"""
+        if rate != self._last_applied_rate:
+            self.tts_engine.setProperty('rate', rate)
+            self._last_applied_rate = rate
+    
+    def _set_volume(self, volume):
+        """Set the engine volume, skipping the call if it is already applied"""
+        if volume != self._last_applied_volume:
+            self.tts_engine.setProperty('volume', volume)
+            self._last_applied_volume = volume
+    
+    def _get_system_voices(self):
+        """Return the engine's voices, queried once per engine"""
+        if self._voices_cache is None:
+            self._voices_cache = list(self.tts_engine.getProperty('voices') or [])
+        return self._voices_cache
+    
+    @property
+    def is_speaking(self) -> bool:
+        """Whether the speech worker is currently speaking"""
+        return self._speaking_event.is_set()
+    
     def start_speech_thread(self):
         """Start background thread for processing speech queue"""
         if self.speech_thread and self.speech_thread.is_alive():
             return
         
+        with self._speech_cond:
+            self._speech_stopping = False
+        
         self.speech_thread = threading.Thread(target=self._speech_worker, daemon=True)
         self.speech_thread.start()
         self.logger.info("Speech processing thread started")
     
     def _speech_worker(self):
         """Background worker for processing speech queue"""
+        pending = self._speech_pending
         while True:
-            try:
-                # Get speech request from queue (blocking)
-                speech_request = self.speech_queue.get(timeout=1)
-                
-                if speech_request is None:  # Shutdown signal
+            # Block until a request arrives or shutdown() sets the stop flag
+            with self._speech_cond:
+                while not pending and not self._speech_stopping:
+                    self._speech_cond.wait()
+                if self._speech_stopping:
                     break
                 
-                self.is_speaking = True
-                self._speak_text(speech_request)
-                self.is_speaking = False
-                
-                # Mark task as done
-                self.speech_queue.task_done()
-                
-            except queue.Empty:
-                continue
+                # Take whatever else is already queued so a burst is spoken together
+                batch = [pending.popleft() for _ in range(min(len(pending), self.MAX_SPEECH_BATCH))]
+            
+            try:
+                for merged_request in self._merge_speech_requests(batch):
+                    self._speaking_event.set()
+                    try:
+                        self._speak_text(merged_request)
+                    finally:
+                        self._speaking_event.clear()
             except Exception as e:
                 self.logger.error(f"Error in speech worker: {e}")
-                self.is_speaking = False
+    
+    def _merge_speech_requests(self, requests):
+        """Join consecutive same-persona requests into single utterances"""
+        merged = []
+        for request in requests:
+            last = merged[-1] if merged else None
+            if (last is not None and not request.get("interrupt")
+                    and last.get("persona") == request.get("persona")):
+                separator = " " if last["text"].endswith((".", "!", "?")) else ". "
+                last["text"] = last["text"] + separator + request.get("text", "")
+                last["merged"] = True
+            else:
+                merged.append(dict(request))
+        return merged
     
     def _speak_text(self, speech_request):
         """Actually speak the text using the configured TTS engine"""
@@ -234,16 +472,20 @@ class VoiceNotificationSystem:
         
         try:
             if hasattr(self.tts_engine, 'say'):  # pyttsx3
-                # Apply persona settings
-                if persona in self.voice_personas:
-                    persona_settings = self.voice_personas[persona]
-                    self.tts_engine.setProperty('rate', persona_settings.get("rate", self.voice_rate))
-                
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
+                # Apply persona rate; consecutive requests with the same rate
+                # leave the engine untouched
+                self._set_rate(self.voice_personas.get(persona, {}).get("rate", self.voice_rate))
                 
-                # Reset to default rate
-                self.tts_engine.setProperty('rate', self.voice_rate)
+                # Merged batches and long texts are effectively unique, so they
+                # would only fill the cache; speak them directly
+                cached_path = None
+                if not speech_request.get("merged") and len(text) <= self.AUDIO_CACHE_MAX_CHARS:
+                    cached_path = self._cached_speech_audio(text, persona)
+                if cached_path:
+                    self._play_audio_file(cached_path)
+                else:
+                    self.tts_engine.say(text)
+                    self.tts_engine.runAndWait()
                 
             elif hasattr(self, 'platform_tts'):
                 self._speak_platform_specific(text, persona)
@@ -251,10 +493,78 @@ class VoiceNotificationSystem:
         except Exception as e:
             self.logger.error(f"Error speaking text: {e}")
     
+    def _find_audio_player(self):
+        """Find a way to play cached audio files on this platform"""
+        if sys.platform.startswith('win'):
+            return "winsound"
+        
+        return shutil.which("afplay" if sys.platform.startswith('darwin') else "aplay")
+    
+    def _load_audio_cache_index(self):
+        """Index audio files cached by previous runs, oldest first"""
+        if not self._audio_cache_enabled or not os.path.isdir(self._audio_cache_dir):
+            return
+        
+        try:
+            paths = [
+                os.path.join(self._audio_cache_dir, name)
+                for name in os.listdir(self._audio_cache_dir)
+                if name.endswith(".wav")
+            ]
+            paths.sort(key=os.path.getmtime)
+            for path in paths:
+                self._audio_cache[os.path.basename(path)[:-4]] = path
+        except OSError as e:
+            self.logger.warning(f"Could not index TTS audio cache: {e}")
+    
+    def _cached_speech_audio(self, text, persona):
+        """Return a cached audio file for text, synthesizing it on a miss"""
+        if (not self._audio_cache_enabled or self._audio_player is None
+                or not hasattr(self.tts_engine, 'save_to_file')):
+            return None
+        
+        key_source = f"{text}\0{persona}\0{self.voice_gender}\0{self.voice_rate}\0{self.voice_volume}"
+        key = hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+        path = os.path.join(self._audio_cache_dir, f"{key}.wav")
+        
+        if key in self._audio_cache and os.path.exists(path):
+            self._audio_cache.move_to_end(key)
+            return path
+        
+        try:
+            os.makedirs(self._audio_cache_dir, exist_ok=True)
+            self.tts_engine.save_to_file(text, path)
+            self.tts_engine.runAndWait()
+        except Exception as e:
+            self.logger.warning(f"Failed to cache synthesized speech: {e}")
+            return None
+        
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        
+        self._audio_cache[key] = path
+        while len(self._audio_cache) > self._audio_cache_size:
+            _, old_path = self._audio_cache.popitem(last=False)
+            try:
+                os.unlink(old_path)
+            except OSError:
+                pass
+        
+        return path
+    
+    def _play_audio_file(self, path):
+        """Play a cached audio file and wait for it to finish"""
+        if self._audio_player == "winsound":
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+        else:
+            cmd = [self._audio_player, path]
+            if self._audio_player.endswith("aplay"):
+                cmd.insert(1, "-q")
+            subprocess.run(cmd, check=True)
+    
     def _speak_platform_specific(self, text, persona):
         """Speak using platform-specific TTS"""
-        import subprocess
-        
         try:
             if self.platform_tts == "windows":
                 # Windows SAPI
@@ -266,24 +576,79 @@ class VoiceNotificationSystem:
                 cmd = ['say', '-r', str(rate), text]
                 subprocess.run(cmd, check=True)
                 
+            elif self.platform_tts == "linux_piper":
+                # Piper writes one WAV per JSON line and prints its path
+                process = self._get_piper_process()
+                process.stdin.write(json.dumps({"text": text}) + "\n")
+                process.stdin.flush()
+                wav_path = process.stdout.readline().strip()
+                if wav_path:
+                    try:
+                        self._play_audio_file(wav_path)
+                    finally:
+                        os.unlink(wav_path)
+                
+            elif self.platform_tts == "linux_espeak_ctypes":
+                # In-process libespeak-ng; Synchronize blocks until playback ends
+                rate = self.voice_personas.get(persona, {}).get("rate", self.voice_rate)
+                data = text.encode("utf-8")
+                self._espeak_lib.espeak_SetParameter(ESPEAK_RATE, rate, 0)
+                self._espeak_lib.espeak_Synth(
+                    data, len(data) + 1, 0, ESPEAK_POS_CHARACTER, 0, ESPEAK_CHARS_UTF8, None, None
+                )
+                self._espeak_lib.espeak_Synchronize()
+                
             elif self.platform_tts == "linux_espeak":
-                # Linux espeak
+                # Linux espeak; the CLI has no end-of-utterance signal, so each
+                # utterance runs to completion (libespeak-ng above avoids the spawn)
                 rate = self.voice_personas.get(persona, {}).get("rate", self.voice_rate)
                 cmd = ['espeak', '-s', str(rate), text]
                 subprocess.run(cmd, check=True)
                 
             elif self.platform_tts == "linux_festival":
-                # Linux festival
-                cmd = ['festival', '--tts']
-                process = subprocess.Popen(cmd, stdin=subprocess.PIPE, text=True)
-                process.communicate(input=text)
+                # Linux festival, one persistent interpreter in pipe mode; the
+                # sentinel is printed only after SayText has finished playing
+                process = self._get_festival_process()
+                escaped = text.replace('\\', '\\\\').replace('"', '\\"')
+                process.stdin.write(f'(SayText "{escaped}")\n(print "{FESTIVAL_DONE}")\n')
+                process.stdin.flush()
+                for line in process.stdout:
+                    if FESTIVAL_DONE in line:
+                        break
                 
         except Exception as e:
             self.logger.error(f"Error with platform-specific TTS: {e}")
     
+    def _get_festival_process(self):
+        """Return the running festival interpreter, starting it if needed"""
+        process = self._tts_procs.get(("festival", None))
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                ['festival', '--pipe'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+            # Make SayText block until playback ends so the sentinel marks completion
+            process.stdin.write("(audio_mode 'sync)\n")
+            self._tts_procs[("festival", None)] = process
+        return process
+    
+    def _close_tts_processes(self):
+        """Terminate persistent TTS processes"""
+        for process in self._tts_procs.values():
+            try:
+                process.stdin.close()
+                process.wait(timeout=1)
+            except Exception:
+                process.kill()
+        self._tts_procs.clear()
+    
     def speak_notification(self, text: str, urgency: str = "normal", interrupt: bool = False):
         """Queue a notification for speech"""
-        if not self.enabled or not self.is_initialized:
+        if not self.enabled or not self._ensure_initialized():
             return False
         
         # Clean up text for speech
@@ -292,16 +657,29 @@ class VoiceNotificationSystem:
         if not clean_text:
             return False
         
-        # Map urgency to persona
-        persona_map = {
-            "low": "calm",
-            "normal": "normal", 
-            "high": "friendly",
-            "urgent": "urgent",
-            "critical": "urgent"
-        }
+        return self._queue_speech(clean_text, urgency, interrupt)
+    
+    def speak_notifications_bulk(self, items: List[Tuple[str, str]]):
+        """Queue several (text, urgency) notifications as a single utterance"""
+        if not self.enabled or not self._ensure_initialized():
+            return False
+        
+        texts = []
+        for text, _ in items:
+            clean_text = self.prepare_text_for_speech(text)
+            if clean_text:
+                texts.append(clean_text if clean_text.endswith((".", "!", "?")) else clean_text + ".")
         
-        persona = persona_map.get(urgency, "normal")
+        if not texts:
+            return False
+        
+        # Speak the whole group with the most urgent persona
+        urgency = max((u for _, u in items), key=lambda u: self._URGENCY_ORDER.get(u, 1))
+        return self._queue_speech(" ".join(texts), urgency)
+    
+    def _queue_speech(self, clean_text: str, urgency: str, interrupt: bool = False):
+        """Put already-cleaned text on the speech queue"""
+        persona = self._PERSONA_MAP.get(urgency, "normal")
         
         speech_request = {
             "text": clean_text,
@@ -310,44 +688,41 @@ class VoiceNotificationSystem:
             "interrupt": interrupt
         }
         
-        if interrupt and self.is_speaking:
+        if interrupt and self._speaking_event.is_set():
             # Clear queue and stop current speech for urgent interruptions
             self.stop_all_speech()
         
-        try:
-            self.speech_queue.put(speech_request, timeout=1)
-            return True
-        except queue.Full:
-            self.logger.warning("Speech queue is full, skipping notification")
-            return False
+        rank = self._URGENCY_ORDER.get
+        with self._speech_cond:
+            pending = self._speech_pending
+            
+            # Identical text already waiting to be spoken
+            if any(r["text"] == clean_text and r["persona"] == persona for r in pending):
+                return True
+            
+            if len(pending) >= self.MAX_PENDING_SPEECH:
+                # Make room by dropping the oldest of the least urgent requests
+                victim = min(pending, key=lambda r: rank(r["urgency"], 1))
+                if rank(victim["urgency"], 1) > rank(urgency, 1):
+                    self.logger.warning("Speech queue is full, skipping notification")
+                    return False
+                pending.remove(victim)
+            
+            pending.append(speech_request)
+            self._speech_cond.notify()
+        
+        return True
     
     def prepare_text_for_speech(self, text: str) -> str:
         """Clean and prepare text for speech synthesis"""
-        import re
-        
         # Remove emojis and special characters
-        clean_text = re.sub(r'[^\w\s\.\!\?\,\-\:\;]', '', text)
-        
-        # Replace common abbreviations and symbols
-        replacements = {
-            '&': 'and',
-            '@': 'at',
-            '#': 'number',
-            '%': 'percent',
-            '$': 'dollars',
-            '€': 'euros',
-            '£': 'pounds',
-            '...': ' ',
-            '--': ' ',
-            'AI': 'A I',
-            'API': 'A P I',
-            'URL': 'U R L',
-            'UI': 'U I',
-            'UX': 'U X'
-        }
+        if not text.isascii():
+            # Keep letters and digits of any script, like the old \w pattern did
+            text = ''.join(ch for ch in text if ch.isascii() or ch.isalnum() or ch.isspace())
+        clean_text = text.translate(self._DELETE_TABLE)
         
-        for old, new in replacements.items():
-            clean_text = clean_text.replace(old, new)
+        # Replace common abbreviations and symbols in a single pass
+        clean_text = self._REPLACEMENTS_RE.sub(self._replace_match, clean_text)
         
         # Remove extra whitespace
         clean_text = ' '.join(clean_text.split())
@@ -360,21 +735,39 @@ class VoiceNotificationSystem:
         return clean_text.strip()
     
     def speak_task_notification(self, task_title: str, notification_type: str):
-        """Speak task-related notifications"""
-        message_templates = {
-            "deadline_soon": f"Attention: The task '{task_title}' is due soon.",
-            "deadline_now": f"Alert: The task '{task_title}' deadline has arrived.",
-            "completed": f"Great job! Task '{task_title}' has been completed.",
-            "overdue": f"Warning: The task '{task_title}' is overdue.",
-            "reminder": f"Reminder: Don't forget about the task '{task_title}'.",
-            "focus_start": f"Starting focus session for '{task_title}'. Good luck!",
-            "focus_complete": f"Focus session completed for '{task_title}'. Time for a break!"
-        }
+        """Speak task-related notifications
         
-        message = message_templates.get(notification_type, f"Notification for task: {task_title}")
-        urgency = "urgent" if notification_type in ["deadline_now", "overdue"] else "normal"
+        Fire-and-forget: the message is buffered for TASK_NOTIFICATION_WINDOW
+        and queued later, so True only means it was accepted for speech.
+        """
+        template = self._TASK_TEMPLATES.get(notification_type)
+        message = template.format(task_title) if template else f"Notification for task: {task_title}"
+        urgency = "urgent" if notification_type in self._URGENT_TASK_TYPES else "normal"
+        
+        if not self.enabled:
+            return False
         
-        return self.speak_notification(message, urgency)
+        # Collect a burst of task notifications and speak them together
+        with self._task_buffer_lock:
+            self._task_buffer.append((message, urgency))
+            if self._task_flush_timer is None:
+                self._task_flush_timer = threading.Timer(
+                    self.TASK_NOTIFICATION_WINDOW, self._flush_task_notifications
+                )
+                self._task_flush_timer.daemon = True
+                self._task_flush_timer.start()
+        
+        return True
+    
+    def _flush_task_notifications(self):
+        """Speak the task notifications collected during the last window"""
+        with self._task_buffer_lock:
+            items = self._task_buffer
+            self._task_buffer = []
+            self._task_flush_timer = None
+        
+        if items:
+            self.speak_notifications_bulk(items)
     
     def speak_system_status(self, status_info: Dict):
         """Speak system status information"""
@@ -415,19 +808,26 @@ class VoiceNotificationSystem:
     def stop_all_speech(self):
         """Stop all current and queued speech"""
         try:
-            # Clear the queue
-            while not self.speech_queue.empty():
-                try:
-                    self.speech_queue.get_nowait()
-                    self.speech_queue.task_done()
-                except queue.Empty:
-                    break
+            # Clear the queue in one step; the worker's stop flag is left alone
+            with self._speech_cond:
+                self._speech_pending.clear()
+            
+            # Drop task notifications still waiting to be grouped
+            with self._task_buffer_lock:
+                self._task_buffer = []
+                if self._task_flush_timer is not None:
+                    self._task_flush_timer.cancel()
+                    self._task_flush_timer = None
             
             # Stop current speech
             if hasattr(self.tts_engine, 'stop'):
                 self.tts_engine.stop()
             
-            self.is_speaking = False
+            # Persistent TTS processes may still hold buffered text
+            self._close_tts_processes()
+            if self._espeak_lib is not None:
+                self._espeak_lib.espeak_Cancel()
+            
             self.logger.info("All speech stopped")
             
         except Exception as e:
@@ -449,7 +849,7 @@ class VoiceNotificationSystem:
         self.voice_config["rate"] = self.voice_rate
         
         if self.tts_engine and hasattr(self.tts_engine, 'setProperty'):
-            self.tts_engine.setProperty('rate', self.voice_rate)
+            self._set_rate(self.voice_rate)
         
         self.save_config()
     
@@ -459,51 +859,61 @@ class VoiceNotificationSystem:
         self.voice_config["volume"] = self.voice_volume
         
         if self.tts_engine and hasattr(self.tts_engine, 'setProperty'):
-            self.tts_engine.setProperty('volume', self.voice_volume)
+            self._set_volume(self.voice_volume)
         
         self.save_config()
     
     def save_config(self):
-        """Save voice configuration"""
+        """Schedule a save of the voice configuration"""
+        self.config["voice"] = self.voice_config
+        self._config_dirty.set()
+        
+        if self._config_writer is None or not self._config_writer.is_alive():
+            self._config_writer = threading.Thread(target=self._config_writer_loop, daemon=True)
+            self._config_writer.start()
+    
+    def _config_writer_loop(self):
+        """Coalesce bursts of save_config calls into a single write"""
+        while True:
+            self._config_dirty.wait()
+            time.sleep(0.5)
+            self._config_dirty.clear()
+            self._write_config()
+    
+    def _write_config(self):
+        """Write the cached configuration to disk"""
         try:
-            config_file = "data/config.json"
-            
-            # Load current config
-            try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-            except FileNotFoundError:
-                config = {}
-            
-            # Update voice settings
-            config["voice"] = self.voice_config
-            
-            # Save updated config
-            with open(config_file, 'w') as f:
-                json.dump(config, f, indent=4)
-                
+            with self._config_lock:
+                with open(self.config_path, 'w') as f:
+                    json.dump(self.config, f, indent=4)
         except Exception as e:
             self.logger.error(f"Failed to save voice configuration: {e}")
     
     def get_available_voices(self) -> List[Dict]:
         """Get list of available voices"""
+        if self.enabled:
+            self._ensure_initialized()
+        
+        if self._available_voices_cache is not None:
+            return list(self._available_voices_cache)
+        
         voices = []
         
         if self.tts_engine and hasattr(self.tts_engine, 'getProperty'):
             try:
-                system_voices = self.tts_engine.getProperty('voices')
+                system_voices = self._get_system_voices()
                 for voice in system_voices:
                     voices.append({
                         "id": voice.id,
                         "name": voice.name,
                         "language": getattr(voice, 'languages', ['en'])[0] if hasattr(voice, 'languages') else 'en',
-                        "gender": "female" if any(keyword in voice.name.lower() 
-                                                for keyword in ['female', 'woman']) else "male"
+                        "gender": "female" if self._FEMALE_NAME_RE.search(voice.name) else "male"
                     })
+                self._available_voices_cache = voices
             except Exception as e:
                 self.logger.error(f"Error getting available voices: {e}")
         
-        return voices
+        return list(voices)
     
     def test_voice(self, test_text: str = "This is a test of the voice notification system."):
         """Test the voice system with sample text"""
@@ -514,7 +924,9 @@ class VoiceNotificationSystem:
         self.stop_all_speech()
         
         # Signal speech thread to stop
-        self.speech_queue.put(None)
+        with self._speech_cond:
+            self._speech_stopping = True
+            self._speech_cond.notify_all()
         
         if self.speech_thread and self.speech_thread.is_alive():
             self.speech_thread.join(timeout=2)
@@ -522,17 +934,22 @@ class VoiceNotificationSystem:
         if self.tts_engine and hasattr(self.tts_engine, 'stop'):
             self.tts_engine.stop()
         
+        self._close_tts_processes()
+        
+        # Flush a pending debounced save before exit
+        if self._config_dirty.is_set():
+            self._config_dirty.clear()
+            self._write_config()
+        
         self.logger.info("Voice notification system shutdown")
 
 # Test the voice system
 if __name__ == "__main__":
-    import time
-    
     print("Testing Voice Notification System...")
     
     voice_system = VoiceNotificationSystem()
     
-    if voice_system.is_initialized:
+    if voice_system._ensure_initialized():
         print("✅ Voice system initialized")
         
         # Test basic notification
@@ -1,38 +1,629 @@
 import os
+import re
 import json
+import copy
 import uuid
+import secrets
 import hashlib
 import hmac
 import time
 import logging
+import functools
+import operator
+import string
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any
-from flask import Flask, request, jsonify, render_template_string
-from flask_cors import CORS
-import jwt
+from flask import Flask, Blueprint, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import threading
-import requests
 from urllib.parse import urlparse
 
+try:
+    from waitress import create_server
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+try:
+    import orjson
+    
+    _RESPONSE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson for request and response bodies"""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=_RESPONSE_OPTIONS).decode("utf-8")
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    def _response_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_RESPONSE_OPTIONS)
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    def _loads(data: bytes):
+        return orjson.loads(data)
+    
+    def _canonical_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    
+    ORJSON_AVAILABLE = True
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    
+    def _loads(data: bytes):
+        return json.loads(data)
+    
+    def _canonical_dumps(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    
+    def _response_dumps(obj) -> bytes:
+        return json.dumps(obj, default=DefaultJSONProvider.default, separators=(",", ":")).encode("utf-8")
+    
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Constant error bodies, serialized once
+_UNAUTHORIZED_BODY = b'{"error": "Unauthorized"}'
+_MISSING_FIELDS_BODY = b'{"error": "Missing required fields"}'
+_RATE_LIMITED_BODY = b'{"error": "Rate limit exceeded"}'
+
+def _error_response(body: bytes, status: int) -> Response:
+    """Wrap a pre-serialized JSON error body in a fresh response"""
+    return Response(body, status=status, mimetype="application/json")
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """Serialize payload straight to bytes, skipping jsonify's str round trip"""
+    return Response(_response_dumps(payload), status=status, mimetype="application/json")
+
+# Fallback chat intents, checked in order; the lookaheads keep that priority
+# in a single match at the start of the message
+_INTENT_RE = re.compile(
+    r"(?=.*(?:estimate|project|cost|time))(?P<estimate>)"
+    r"|(?=.*(?:team|member|skill|developer))(?P<team>)"
+    r"|(?=.*(?:analytics|report|data|insight))(?P<analytics>)"
+    r"|(?=.*(?:status|health|system))(?P<status>)",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Canned fallback replies per intent; read-only so they can be returned as-is
+_FALLBACK_REPLIES = {
+    "estimate": MappingProxyType({
+        "message": "I can help you estimate your project! Please provide more details about your project requirements, technologies, and timeline.",
+        "actions": ("show_estimation_form",)
+    }),
+    "team": MappingProxyType({
+        "message": "I can recommend team members based on your project needs. What skills or roles are you looking for?",
+        "actions": ("show_team_search",)
+    }),
+    "analytics": MappingProxyType({
+        "message": "I can provide analytics and insights about your projects and team performance. What specific metrics would you like to see?",
+        "actions": ("show_analytics",)
+    }),
+    None: MappingProxyType({
+        "message": "I'm here to help with project estimation, team recommendations, analytics, and system management. How can I assist you today?",
+        "actions": ("show_help_menu",)
+    })
+}
+_FALLBACK_STATUS_TEMPLATE = "System is running well! %d data sources are active out of %d total sources."
+_FALLBACK_STATUS_ACTIONS = ("show_detailed_status",)
+
+# Snippet customers paste into their dashboard to embed the widget
+_INTEGRATION_TEMPLATE = string.Template("""<!-- AI Avatar Assistant Widget Integration -->
+<div id="ai-avatar-widget-container"></div>
+
+<script>
+(function() {
+    const widgetContainer = document.getElementById('ai-avatar-widget-container');
+    const iframe = document.createElement('iframe');
+    
+    iframe.src = 'http://localhost:$port/widget/embed/$widget_id';
+    iframe.style.width = '400px';
+    iframe.style.height = '500px';
+    iframe.style.border = '1px solid #ddd';
+    iframe.style.borderRadius = '8px';
+    iframe.frameBorder = '0';
+    iframe.allowTransparency = 'true';
+    
+    widgetContainer.appendChild(iframe);
+    
+    // Widget API for custom interactions
+    window.AIAvatar = {
+        widgetId: '$widget_id',
+        apiKey: '$api_key',
+        baseUrl: 'http://localhost:$port',
+        
+        async chat(message) {
+            const response = await fetch(this.baseUrl + '/api/chat', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    widget_id: this.widgetId,
+                    api_key: this.apiKey,
+                    message: message
+                })
+            });
+            return await response.json();
+        },
+        
+        async estimate(projectData) {
+            const response = await fetch(this.baseUrl + '/api/estimate', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    widget_id: this.widgetId,
+                    api_key: this.apiKey,
+                    ...projectData
+                })
+            });
+            return await response.json();
+        },
+        
+        async getAnalytics() {
+            const response = await fetch(
+                `$${this.baseUrl}/api/analytics?widget_id=$${this.widgetId}&api_key=$${this.apiKey}`
+            );
+            return await response.json();
+        }
+    };
+})();
+</script>""")
+
+# Estimate attributes returned by /api/estimate, read in one attrgetter call
+ESTIMATE_FIELDS = (
+    "project_name", "total_hours", "optimistic_hours", "realistic_hours",
+    "pessimistic_hours", "complexity_score", "difficulty_level", "confidence_level",
+    "risk_score", "risk_factors", "technologies", "recommended_team_size",
+    "recommended_roles", "team_members", "phase_breakdown", "similar_projects"
+)
+_get_estimate_fields = operator.attrgetter(*ESTIMATE_FIELDS)
+
+# Widget stylesheet and script, shared by every embedded widget
+WIDGET_CSS = """
+.ai-avatar-widget {
+    border: 1px solid #ddd;
+    border-radius: 8px;
+    background: white;
+    display: flex;
+    flex-direction: column;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    position: relative;
+    overflow: hidden;
+}
+
+.widget-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 12px 16px;
+    display: flex;
+    align-items: center;
+    justify-content: between;
+}
+
+.avatar-icon {
+    width: 32px;
+    height: 32px;
+    border-radius: 50%;
+    background: rgba(255,255,255,0.2);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin-right: 12px;
+    font-size: 16px;
+}
+
+.widget-title {
+    flex: 1;
+    font-weight: 600;
+    font-size: 14px;
+}
+
+.status-indicator {
+    width: 8px;
+    height: 8px;
+    border-radius: 50%;
+    background: #4CAF50;
+    animation: pulse 2s infinite;
+}
+
+@keyframes pulse {
+    0% { opacity: 1; }
+    50% { opacity: 0.5; }
+    100% { opacity: 1; }
+}
+
+.widget-content {
+    flex: 1;
+    padding: 16px;
+    display: flex;
+    flex-direction: column;
+    overflow-y: auto;
+}
+
+.chat-area {
+    flex: 1;
+    min-height: 200px;
+    border: 1px solid #eee;
+    border-radius: 4px;
+    padding: 12px;
+    margin-bottom: 12px;
+    overflow-y: auto;
+    background: #fafafa;
+}
+
+.message {
+    margin-bottom: 12px;
+    padding: 8px 12px;
+    border-radius: 12px;
+    max-width: 80%;
+    word-wrap: break-word;
+}
+
+.message.user {
+    background: #667eea;
+    color: white;
+    margin-left: auto;
+    text-align: right;
+}
+
+.message.assistant {
+    background: white;
+    border: 1px solid #e0e0e0;
+    margin-right: auto;
+}
+
+.input-area {
+    display: flex;
+    gap: 8px;
+}
+
+.message-input {
+    flex: 1;
+    padding: 8px 12px;
+    border: 1px solid #ddd;
+    border-radius: 20px;
+    outline: none;
+    font-size: 14px;
+}
+
+.send-button {
+    padding: 8px 16px;
+    background: #667eea;
+    color: white;
+    border: none;
+    border-radius: 20px;
+    cursor: pointer;
+    font-size: 14px;
+    font-weight: 500;
+}
+
+.send-button:hover {
+    background: #5a67d8;
+}
+
+.send-button:disabled {
+    background: #ccc;
+    cursor: not-allowed;
+}
+
+.quick-actions {
+    display: flex;
+    gap: 8px;
+    margin-bottom: 12px;
+    flex-wrap: wrap;
+}
+
+.quick-action {
+    padding: 4px 8px;
+    background: #f0f0f0;
+    border: 1px solid #ddd;
+    border-radius: 12px;
+    font-size: 12px;
+    cursor: pointer;
+    transition: all 0.2s;
+}
+
+.quick-action:hover {
+    background: #667eea;
+    color: white;
+}
+
+.loading {
+    display: none;
+    text-align: center;
+    color: #666;
+    font-style: italic;
+}
+"""
+
+WIDGET_JS = """
+const WIDGET_CONFIG = document.currentScript.dataset;
+const WIDGET_ID = WIDGET_CONFIG.widgetId;
+const API_KEY = WIDGET_CONFIG.apiKey;
+const BASE_URL = WIDGET_CONFIG.baseUrl;
+
+let isLoading = false;
+
+function addMessage(content, isUser = false) {
+    const chatArea = document.getElementById('chatArea');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${isUser ? 'user' : 'assistant'}`;
+    messageDiv.textContent = content;
+    chatArea.appendChild(messageDiv);
+    chatArea.scrollTop = chatArea.scrollHeight;
+}
+
+function setLoading(loading) {
+    isLoading = loading;
+    document.getElementById('loading').style.display = loading ? 'block' : 'none';
+    document.getElementById('sendButton').disabled = loading;
+    document.getElementById('messageInput').disabled = loading;
+}
+
+async function sendMessage() {
+    const input = document.getElementById('messageInput');
+    const message = input.value.trim();
+
+    if (!message || isLoading) return;
+
+    addMessage(message, true);
+    input.value = '';
+    setLoading(true);
+
+    try {
+        const response = await fetch(`${BASE_URL}/api/chat`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                widget_id: WIDGET_ID,
+                api_key: API_KEY,
+                message: message,
+                context: {
+                    domain: window.location.hostname,
+                    timestamp: new Date().toISOString()
+                }
+            })
+        });
+
+        const data = await response.json();
+
+        if (data.success) {
+            addMessage(data.response.message || data.response);
+        } else {
+            addMessage('Sorry, I encountered an error. Please try again.');
+        }
+
+    } catch (error) {
+        console.error('Chat error:', error);
+        addMessage('Sorry, I couldn\\'t connect to the server. Please try again.');
+    } finally {
+        setLoading(false);
+    }
+}
+
+async function quickAction(action) {
+    if (isLoading) return;
+
+    setLoading(true);
+
+    try {
+        let response;
+
+        switch (action) {
+            case 'estimate':
+                addMessage('📊 I can help you estimate a project. Please describe your project requirements.', false);
+                break;
+
+            case 'team':
+                response = await fetch(`${BASE_URL}/api/data/team?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
+                const teamData = await response.json();
+                if (teamData.success) {
+                    addMessage(`👥 Found ${teamData.count} team members available. What kind of skills are you looking for?`, false);
+                }
+                break;
+
+            case 'analytics':
+                response = await fetch(`${BASE_URL}/api/analytics?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
+                const analyticsData = await response.json();
+                if (analyticsData.success) {
+                    addMessage('📈 Here\\'s your current analytics overview. Your productivity is looking good!', false);
+                }
+                break;
+
+            case 'status':
+                response = await fetch(`${BASE_URL}/api/status?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
+                const statusData = await response.json();
+                if (statusData.success) {
+                    const status = statusData.status;
+                    addMessage(`⚡ System Status: ${status.data_sources.active_sources}/${status.data_sources.total_sources} data sources active, ${status.widget_count} widgets deployed.`, false);
+                }
+                break;
+        }
+
+    } catch (error) {
+        console.error('Quick action error:', error);
+        addMessage('Sorry, I couldn\\'t complete that action. Please try again.');
+    } finally {
+        setLoading(false);
+    }
+}
+
+function handleKeyPress(event) {
+    if (event.key === 'Enter' && !event.shiftKey) {
+        event.preventDefault();
+        sendMessage();
+    }
+}
+
+// Initialize widget
+document.addEventListener('DOMContentLoaded', function() {
+    console.log('AI Avatar Widget initialized');
+
+    // Send initial status check
+    quickAction('status');
+});
+"""
+
+# Content hash in the asset URLs lets browsers cache them indefinitely
+WIDGET_ASSET_HASH = hashlib.sha256((WIDGET_CSS + WIDGET_JS).encode("utf-8")).hexdigest()[:12]
+
+# Per-widget page shell, filled in with str.format_map
+WIDGET_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AI Avatar Assistant Widget</title>
+    <link rel="stylesheet" href="{base_url}/widget/static/widget.{asset_hash}.css">
+</head>
+<body>
+    <div class="ai-avatar-widget" style="width: {width}; height: {height};">
+        <div class="widget-header">
+            <div class="avatar-icon">🤖</div>
+            <div class="widget-title">AI Assistant</div>
+            <div class="status-indicator"></div>
+        </div>
+        
+        <div class="widget-content">
+            <div class="quick-actions">
+                <div class="quick-action" onclick="quickAction('estimate')">📊 Estimate Project</div>
+                <div class="quick-action" onclick="quickAction('team')">👥 Find Team</div>
+                <div class="quick-action" onclick="quickAction('analytics')">📈 Analytics</div>
+                <div class="quick-action" onclick="quickAction('status')">⚡ Status</div>
+            </div>
+            
+            <div class="chat-area" id="chatArea">
+                <div class="message assistant">
+                    Hello! I'm your AI Assistant. I can help you with project estimation, team recommendations, analytics, and more. What would you like to know?
+                </div>
+            </div>
+            
+            <div class="loading" id="loading">AI is thinking...</div>
+            
+            <div class="input-area">
+                <input type="text" 
+                       class="message-input" 
+                       id="messageInput" 
+                       placeholder="Type your message..."
+                       onkeypress="handleKeyPress(event)">
+                <button class="send-button" onclick="sendMessage()" id="sendButton">Send</button>
+            </div>
+        </div>
+    </div>
+
+    <script src="{base_url}/widget/static/widget.{asset_hash}.js"
+            data-widget-id="{widget_id}"
+            data-api-key="{api_key}"
+            data-base-url="{base_url}"></script>
+</body>
+</html>
+"""
+
 class WidgetAPIServer:
     """API server for embedding AI Avatar Assistant as a widget in external dashboards"""
     
-    def __init__(self, ai_assistant, data_source_manager, project_estimator, port=5555):
+    # Seconds between applying buffered usage counts to widget/key records
+    USAGE_FLUSH_INTERVAL = 5.0
+    
+    # Seconds to wait for further changes before writing the configuration
+    CONFIG_SAVE_DELAY = 2.0
+    
+    # Seconds a shared upstream result (projects, analytics) is reused
+    FETCH_CACHE_TTL = 5.0
+    
+    # Widget action results reused for identical requests
+    RESULT_CACHE_TTL = 60.0
+    RESULT_CACHE_SIZE = 1024
+    _CACHEABLE_ACTIONS = frozenset({"estimate_project", "search_team", "get_analytics"})
+    
+    # API keys are "ak_" followed by 16 hex characters
+    API_KEY_PREFIX = "ak_"
+    API_KEY_LENGTH = 19
+    
+    # Random bytes drawn per refill of the API key token pool (8 bytes per key)
+    KEY_POOL_BYTES = 8 * 64
+    
+    # Worker threads for the waitress WSGI server
+    SERVER_THREADS = 8
+    
+    def __init__(self, ai_assistant, data_source_manager, project_estimator, port=5555, enable_cors=True):
         self.ai_assistant = ai_assistant
         self.data_source_manager = data_source_manager
         self.project_estimator = project_estimator
         self.port = port
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         
         # Initialize Flask app
         self.app = Flask(__name__)
-        CORS(self.app)  # Enable CORS for cross-origin requests
+        if ORJSON_AVAILABLE:
+            self.app.json = OrjsonProvider(self.app)
+        if enable_cors:
+            from flask_cors import CORS
+            CORS(self.app)  # Enable CORS for cross-origin requests
         
         # Widget management
         self.authorized_widgets = {}  # widget_id -> widget_config
         self.api_keys = {}  # api_key -> client_config
         self.active_sessions = {}  # session_id -> session_data
         
+        # Pre-drawn CSPRNG bytes for API keys, sliced 8 bytes at a time
+        self._key_pool = b""
+        self._key_pool_lock = threading.Lock()
+        
+        # Running counts of active widgets and API keys, updated under _state_lock
+        self._counts = {"active_widgets": 0, "active_api_keys": 0}
+        
+        # Authorization results cached per (widget_id, api_key); cleared on changes
+        self._auth_cache = functools.lru_cache(maxsize=4096)(self._validate_uncached)
+        
+        # Rendered embed HTML per widget_id, as (base_url, etag, html)
+        self._html_cache = {}
+        
+        # Recent upstream results as name -> (monotonic time, value), one fetch at a time
+        self._fetch_cache = {}
+        self._fetch_locks = {
+            "projects": threading.Lock(),
+            "analytics": threading.Lock(),
+            "data_source_status": threading.Lock()
+        }
+        
+        # Last analytics payload as (fetched value, body, etag), reused while the fetch is cached
+        self._analytics_serialized = None
+        
+        # Widget action results as (action, params digest) -> (monotonic time, response)
+        self._result_cache = OrderedDict()
+        self._result_lock = threading.RLock()
+        
+        # Team members with precomputed skill sets, as (members list, index)
+        self._skills_index = None
+        
+        # Per-API-key token buckets as api_key -> [tokens, monotonic time]
+        self.rate_limit = 100  # requests per minute, from settings.rate_limit
+        self._buckets = {}
+        self._bucket_lock = threading.Lock()
+        
+        # Usage counts buffered off the request path, keyed by (widget_id, api_key)
+        self._usage = Counter()
+        self._usage_lock = threading.Lock()
+        
+        # Guards authorized_widgets/api_keys against concurrent request threads
+        self._state_lock = threading.RLock()
+        
+        # Configuration writes are coalesced by a background writer
+        self._config_dirty = threading.Event()
+        self._config_lock = threading.Lock()
+        self._config_writer = None
+        
         # Load configuration
         self.config_file = "data/widget_api_config.json"
         self.load_configuration()
@@ -42,22 +633,31 @@ class WidgetAPIServer:
         
         # Start server thread
         self.server_thread = None
+        self._wsgi_server = None
         self.is_running = False
+        
+        self._usage_thread = threading.Thread(target=self._usage_flush_loop, daemon=True)
+        self._usage_thread.start()
     
     def load_configuration(self):
         """Load widget API configuration"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = _loads(f.read())
                 
-                self.authorized_widgets = config.get("authorized_widgets", {})
-                self.api_keys = config.get("api_keys", {})
+                with self._state_lock:
+                    self.authorized_widgets = config.get("authorized_widgets", {})
+                    self.api_keys = config.get("api_keys", {})
+                    self.rate_limit = config.get("settings", {}).get("rate_limit", self.rate_limit)
+                    self._auth_cache.cache_clear()
+                    self._html_cache.clear()
+                    self._recount_active()
                 
-                self.logger.info(f"Loaded {len(self.authorized_widgets)} authorized widgets")
+                self.logger.info("Loaded %s authorized widgets", len(self.authorized_widgets))
                 
             except Exception as e:
-                self.logger.error(f"Failed to load widget configuration: {e}")
+                self.logger.error("Failed to load widget configuration: %s", e)
                 self.create_default_configuration()
         else:
             self.create_default_configuration()
@@ -82,30 +682,57 @@ class WidgetAPIServer:
         
         self.logger.info("Created default widget API configuration")
     
+    def _recount_active(self):
+        """Recompute the active counts after the records were replaced"""
+        is_active = operator.itemgetter("active")
+        self._counts["active_widgets"] = sum(map(is_active, self.authorized_widgets.values()))
+        self._counts["active_api_keys"] = sum(map(is_active, self.api_keys.values()))
+    
     def save_configuration(self):
-        """Save current configuration"""
+        """Schedule a save of the current configuration"""
+        self._config_dirty.set()
+        
+        if self._config_writer is None or not self._config_writer.is_alive():
+            self._config_writer = threading.Thread(target=self._config_writer_loop, daemon=True)
+            self._config_writer.start()
+    
+    def _config_writer_loop(self):
+        """Write the configuration once per burst of changes"""
+        while True:
+            self._config_dirty.wait()
+            time.sleep(self.CONFIG_SAVE_DELAY)
+            self._config_dirty.clear()
+            self._write_configuration()
+    
+    def _write_configuration(self):
+        """Atomically write the current configuration to disk"""
         try:
-            config = {
-                "authorized_widgets": self.authorized_widgets,
-                "api_keys": self.api_keys,
-                "settings": {
-                    "max_widgets_per_domain": 5,
-                    "session_timeout": 3600,
-                    "rate_limit": 100,
-                    "allowed_origins": ["*"],
-                    "require_https": False
+            with self._state_lock:
+                config = {
+                    "authorized_widgets": self.authorized_widgets,
+                    "api_keys": self.api_keys,
+                    "settings": {
+                        "max_widgets_per_domain": 5,
+                        "session_timeout": 3600,
+                        "rate_limit": 100,
+                        "allowed_origins": ["*"],
+                        "require_https": False
+                    }
                 }
-            }
+                data = _dumps(config)
             
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            with self._config_lock:
+                tmp_file = f"{self.config_file}.tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.config_file)
                 
         except Exception as e:
-            self.logger.error(f"Failed to save widget configuration: {e}")
+            self.logger.error("Failed to save widget configuration: %s", e)
     
     def generate_api_key(self, client_name: str, domain: str, permissions: List[str] = None) -> str:
         """Generate a new API key for a client"""
-        api_key = f"ak_{uuid.uuid4().hex[:16]}"
+        api_key = f"{self.API_KEY_PREFIX}{self._next_key_token()}"
         
         client_config = {
             "client_name": client_name,
@@ -117,12 +744,22 @@ class WidgetAPIServer:
             "active": True
         }
         
-        self.api_keys[api_key] = client_config
+        with self._state_lock:
+            self.api_keys[api_key] = client_config
+            self._counts["active_api_keys"] += 1
         self.save_configuration()
         
-        self.logger.info(f"Generated API key for {client_name} ({domain})")
+        self.logger.info("Generated API key for %s (%s)", client_name, domain)
         return api_key
     
+    def _next_key_token(self) -> str:
+        """Return 16 random hex characters from the pre-drawn byte pool"""
+        with self._key_pool_lock:
+            if not self._key_pool:
+                self._key_pool = secrets.token_bytes(self.KEY_POOL_BYTES)
+            token, self._key_pool = self._key_pool[:8], self._key_pool[8:]
+        return token.hex()
+    
     def authorize_widget(self, api_key: str, widget_url: str, widget_config: Dict) -> str:
         """Authorize a widget for a specific URL"""
         if api_key not in self.api_keys:
@@ -155,627 +792,408 @@ class WidgetAPIServer:
             "active": True
         }
         
-        self.authorized_widgets[widget_id] = widget_data
+        with self._state_lock:
+            self.authorized_widgets[widget_id] = widget_data
+            self._counts["active_widgets"] += 1
+            self._auth_cache.cache_clear()
+            self._html_cache.pop(widget_id, None)
         self.save_configuration()
         
-        self.logger.info(f"Authorized widget {widget_id} for {widget_url}")
+        self.logger.info("Authorized widget %s for %s", widget_id, widget_url)
         return widget_id
     
     def validate_request(self, widget_id: str, api_key: str) -> bool:
         """Validate widget request"""
-        if widget_id not in self.authorized_widgets:
-            return False
-        
-        widget_data = self.authorized_widgets[widget_id]
-        
-        if not widget_data["active"]:
+        # Reject malformed keys before they reach the dicts or the cache
+        if (not isinstance(api_key, str) or len(api_key) != self.API_KEY_LENGTH
+                or not api_key.startswith(self.API_KEY_PREFIX)):
             return False
         
-        if widget_data["api_key"] != api_key:
+        if not self._auth_cache(widget_id, api_key):
             return False
         
-        # Update usage statistics
-        widget_data["last_accessed"] = datetime.now().isoformat()
-        widget_data["access_count"] += 1
-        
-        self.api_keys[api_key]["last_used"] = datetime.now().isoformat()
-        self.api_keys[api_key]["usage_count"] += 1
+        # Record usage; counts are applied to the records by _flush_usage
+        with self._usage_lock:
+            self._usage[(widget_id, api_key)] += 1
         
         return True
-    
-    def setup_routes(self):
-        """Setup Flask routes for the widget API"""
-        
-        @self.app.route('/widget/register', methods=['POST'])
-        def register_widget():
-            """Register a new widget"""
-            try:
-                data = request.get_json()
-                
-                client_name = data.get('client_name')
-                domain = data.get('domain')
-                widget_url = data.get('widget_url')
-                widget_config = data.get('widget_config', {})
-                
-                if not all([client_name, domain, widget_url]):
-                    return jsonify({"error": "Missing required fields"}), 400
-                
-                # Generate API key
-                api_key = self.generate_api_key(client_name, domain)
-                
-                # Authorize widget
-                widget_id = self.authorize_widget(api_key, widget_url, widget_config)
-                
-                return jsonify({
-                    "success": True,
-                    "api_key": api_key,
-                    "widget_id": widget_id,
-                    "widget_url": f"/widget/embed/{widget_id}"
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Widget registration error: {e}")
-                return jsonify({"error": str(e)}), 400
-        
-        @self.app.route('/widget/embed/<widget_id>')
-        def embed_widget(widget_id):
-            """Serve the embeddable widget"""
-            if widget_id not in self.authorized_widgets:
-                return "Widget not found", 404
-            
-            widget_data = self.authorized_widgets[widget_id]
-            if not widget_data["active"]:
-                return "Widget disabled", 403
-            
-            # Generate widget HTML
-            widget_html = self.generate_widget_html(widget_id, widget_data)
-            return widget_html
-        
-        @self.app.route('/api/chat', methods=['POST'])
-        def chat_endpoint():
-            """Handle chat requests from widgets"""
-            try:
-                data = request.get_json()
-                widget_id = data.get('widget_id')
-                api_key = data.get('api_key')
-                message = data.get('message')
-                context = data.get('context', {})
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                # Process chat message through AI assistant
-                response = self.process_chat_message(message, context, widget_id)
-                
-                return jsonify({
-                    "success": True,
-                    "response": response
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Chat endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/estimate', methods=['POST'])
-        def estimate_endpoint():
-            """Handle project estimation requests"""
-            try:
-                data = request.get_json()
-                widget_id = data.get('widget_id')
-                api_key = data.get('api_key')
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                project_description = data.get('project_description')
-                requirements = data.get('requirements', [])
-                technologies = data.get('technologies', [])
-                deadline = data.get('deadline')
-                
-                # Generate project estimate
-                estimate = self.project_estimator.estimate_project(
-                    project_description, requirements, technologies, deadline
-                )
-                
-                # Convert estimate to JSON-serializable format
-                estimate_data = {
-                    "project_name": estimate.project_name,
-                    "total_hours": estimate.total_hours,
-                    "optimistic_hours": estimate.optimistic_hours,
-                    "realistic_hours": estimate.realistic_hours,
-                    "pessimistic_hours": estimate.pessimistic_hours,
-                    "complexity_score": estimate.complexity_score,
-                    "difficulty_level": estimate.difficulty_level,
-                    "confidence_level": estimate.confidence_level,
-                    "risk_score": estimate.risk_score,
-                    "risk_factors": estimate.risk_factors,
-                    "technologies": estimate.technologies,
-                    "recommended_team_size": estimate.recommended_team_size,
-                    "recommended_roles": estimate.recommended_roles,
-                    "team_members": estimate.team_members,
-                    "phase_breakdown": estimate.phase_breakdown,
-                    "similar_projects": estimate.similar_projects
-                }
-                
-                return jsonify({
-                    "success": True,
-                    "estimate": estimate_data
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Estimate endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/data/projects', methods=['GET'])
-        def get_projects():
-            """Get all projects data"""
-            try:
-                widget_id = request.args.get('widget_id')
-                api_key = request.args.get('api_key')
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                projects = self.data_source_manager.get_all_projects()
-                
-                return jsonify({
-                    "success": True,
-                    "projects": projects,
-                    "count": len(projects)
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Projects endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/data/team', methods=['GET'])
-        def get_team_members():
-            """Get team members data"""
-            try:
-                widget_id = request.args.get('widget_id')
-                api_key = request.args.get('api_key')
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                team_members = self.data_source_manager.get_team_members()
-                
-                return jsonify({
-                    "success": True,
-                    "team_members": team_members,
-                    "count": len(team_members)
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Team endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/analytics', methods=['GET'])
-        def get_analytics():
-            """Get analytics data"""
-            try:
-                widget_id = request.args.get('widget_id')
-                api_key = request.args.get('api_key')
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                # Get analytics from the main AI assistant
-                analytics_data = self.ai_assistant.analytics_engine.get_visual_analytics_data()
-                
-                return jsonify({
-                    "success": True,
-                    "analytics": analytics_data
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Analytics endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/actions', methods=['POST'])
-        def execute_action():
-            """Execute actions through the widget"""
-            try:
-                data = request.get_json()
-                widget_id = data.get('widget_id')
-                api_key = data.get('api_key')
-                
-                if not self.validate_request(widget_id, api_key):
-                    return jsonify({"error": "Unauthorized"}), 401
-                
-                action = data.get('action')
-                parameters = data.get('parameters', {})
-                
-                # Execute action through AI assistant's action system
-                result = self.execute_widget_action(action, parameters, widget_id)
-                
-                return jsonify({
-                    "success": True,
-                    "result": result
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Action endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-        
-        @self.app.route('/api/status', methods=['GET'])
-        def get_status():
-            """Get widget and system status"""
-            try:
-                widget_id = request.args.get('widget_id')
-                api_key = request.args.get('api_key')
-                
-                if widget_id and api_key:
-                    if not self.validate_request(widget_id, api_key):
-                        return jsonify({"error": "Unauthorized"}), 401
-                
-                status = {
-                    "server_status": "running",
-                    "data_sources": self.data_source_manager.get_data_source_status(),
-                    "widget_count": len(self.authorized_widgets),
-                    "active_sessions": len(self.active_sessions),
-                    "last_sync": datetime.now().isoformat()
-                }
-                
-                return jsonify({
-                    "success": True,
-                    "status": status
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Status endpoint error: {e}")
-                return jsonify({"error": str(e)}), 500
-    
-    def generate_widget_html(self, widget_id: str, widget_data: Dict) -> str:
-        """Generate HTML for embeddable widget"""
-        widget_config = widget_data.get("config", {})
-        
-        # Get the base URL for API calls
-        base_url = request.host_url.rstrip('/')
-        
-        html_template = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Avatar Assistant Widget</title>
-    <style>
-        .ai-avatar-widget {
-            width: {{ width }};
-            height: {{ height }};
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            background: white;
-            display: flex;
-            flex-direction: column;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            position: relative;
-            overflow: hidden;
-        }
-        
-        .widget-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 12px 16px;
-            display: flex;
-            align-items: center;
-            justify-content: between;
-        }
-        
-        .avatar-icon {
-            width: 32px;
-            height: 32px;
-            border-radius: 50%;
-            background: rgba(255,255,255,0.2);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-right: 12px;
-            font-size: 16px;
-        }
-        
-        .widget-title {
-            flex: 1;
-            font-weight: 600;
-            font-size: 14px;
-        }
-        
-        .status-indicator {
-            width: 8px;
-            height: 8px;
-            border-radius: 50%;
-            background: #4CAF50;
-            animation: pulse 2s infinite;
-        }
-        
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-        
-        .widget-content {
-            flex: 1;
-            padding: 16px;
-            display: flex;
-            flex-direction: column;
-            overflow-y: auto;
-        }
-        
-        .chat-area {
-            flex: 1;
-            min-height: 200px;
-            border: 1px solid #eee;
-            border-radius: 4px;
-            padding: 12px;
-            margin-bottom: 12px;
-            overflow-y: auto;
-            background: #fafafa;
-        }
-        
-        .message {
-            margin-bottom: 12px;
-            padding: 8px 12px;
-            border-radius: 12px;
-            max-width: 80%;
-            word-wrap: break-word;
-        }
-        
-        .message.user {
-            background: #667eea;
-            color: white;
-            margin-left: auto;
-            text-align: right;
-        }
-        
-        .message.assistant {
-            background: white;
-            border: 1px solid #e0e0e0;
-            margin-right: auto;
-        }
-        
-        .input-area {
-            display: flex;
-            gap: 8px;
-        }
-        
-        .message-input {
-            flex: 1;
-            padding: 8px 12px;
-            border: 1px solid #ddd;
-            border-radius: 20px;
-            outline: none;
-            font-size: 14px;
-        }
-        
-        .send-button {
-            padding: 8px 16px;
-            background: #667eea;
-            color: white;
-            border: none;
-            border-radius: 20px;
-            cursor: pointer;
-            font-size: 14px;
-            font-weight: 500;
-        }
-        
-        .send-button:hover {
-            background: #5a67d8;
-        }
+    
+    def _validate_uncached(self, widget_id: str, api_key: str) -> bool:
+        """Check widget credentials against the authorized widgets"""
+        widget_data = self.authorized_widgets.get(widget_id)
+        if widget_data is None or not widget_data["active"]:
+            return False
         
-        .send-button:disabled {
-            background: #ccc;
-            cursor: not-allowed;
-        }
+        # Constant-time comparison so the stored key can't be probed by timing
+        return hmac.compare_digest(widget_data["api_key"].encode("utf-8"), api_key.encode("utf-8"))
+    
+    def _usage_flush_loop(self):
+        """Periodically apply buffered usage counts"""
+        while True:
+            time.sleep(self.USAGE_FLUSH_INTERVAL)
+            self._flush_usage()
+    
+    def _flush_usage(self):
+        """Apply buffered usage counts to widget and API key records"""
+        with self._usage_lock:
+            usage, self._usage = self._usage, Counter()
         
-        .quick-actions {
-            display: flex;
-            gap: 8px;
-            margin-bottom: 12px;
-            flex-wrap: wrap;
-        }
+        if not usage:
+            return
         
-        .quick-action {
-            padding: 4px 8px;
-            background: #f0f0f0;
-            border: 1px solid #ddd;
-            border-radius: 12px;
-            font-size: 12px;
-            cursor: pointer;
-            transition: all 0.2s;
-        }
+        now = datetime.now().isoformat()
+        with self._state_lock:
+            for (widget_id, api_key), count in usage.items():
+                widget_data = self.authorized_widgets.get(widget_id)
+                if widget_data is not None:
+                    widget_data["last_accessed"] = now
+                    widget_data["access_count"] += count
+                
+                client_config = self.api_keys.get(api_key)
+                if client_config is not None:
+                    client_config["last_used"] = now
+                    client_config["usage_count"] += count
+    
+    def setup_routes(self):
+        """Register the widget API views on a blueprint"""
+        bp = Blueprint('widget', __name__)
+        bp.before_request(self._enforce_rate_limit)
+        
+        bp.add_url_rule('/widget/register', view_func=self.register_widget, methods=['POST'])
+        bp.add_url_rule('/widget/embed/<widget_id>', view_func=self.embed_widget)
+        bp.add_url_rule('/widget/static/widget.<asset_hash>.<ext>', view_func=self.widget_asset)
+        bp.add_url_rule('/api/chat', view_func=self.chat_endpoint, methods=['POST'])
+        bp.add_url_rule('/api/estimate', view_func=self.estimate_endpoint, methods=['POST'])
+        bp.add_url_rule('/api/data/projects', view_func=self.get_projects, methods=['GET'])
+        bp.add_url_rule('/api/data/team', view_func=self.get_team_members, methods=['GET'])
+        bp.add_url_rule('/api/analytics', view_func=self.get_analytics, methods=['GET'])
+        bp.add_url_rule('/api/actions', view_func=self.execute_action, methods=['POST'])
+        bp.add_url_rule('/api/status', view_func=self.get_status, methods=['GET'])
+        
+        self.app.register_blueprint(bp)
+    
+    def _enforce_rate_limit(self):
+        """Reject requests from API keys that have used up their token bucket"""
+        api_key = request.args.get('api_key')
+        if api_key is None and request.is_json:
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                api_key = data.get('api_key')
         
-        .quick-action:hover {
-            background: #667eea;
-            color: white;
-        }
+        # Only issued keys get a bucket, so random keys can't grow the table
+        if api_key is None or api_key not in self.api_keys:
+            return None
         
-        .loading {
-            display: none;
-            text-align: center;
-            color: #666;
-            font-style: italic;
-        }
-    </style>
-</head>
-<body>
-    <div class="ai-avatar-widget">
-        <div class="widget-header">
-            <div class="avatar-icon">🤖</div>
-            <div class="widget-title">AI Assistant</div>
-            <div class="status-indicator"></div>
-        </div>
+        now = time.monotonic()
+        with self._bucket_lock:
+            bucket = self._buckets.get(api_key)
+            if bucket is None:
+                bucket = self._buckets[api_key] = [float(self.rate_limit), now]
+            
+            # Refill at rate_limit tokens per minute, capped at one minute's worth
+            bucket[0] = min(float(self.rate_limit), bucket[0] + (now - bucket[1]) * self.rate_limit / 60.0)
+            bucket[1] = now
+            
+            if bucket[0] < 1.0:
+                return _error_response(_RATE_LIMITED_BODY, 429)
+            bucket[0] -= 1.0
         
-        <div class="widget-content">
-            <div class="quick-actions">
-                <div class="quick-action" onclick="quickAction('estimate')">📊 Estimate Project</div>
-                <div class="quick-action" onclick="quickAction('team')">👥 Find Team</div>
-                <div class="quick-action" onclick="quickAction('analytics')">📈 Analytics</div>
-                <div class="quick-action" onclick="quickAction('status')">⚡ Status</div>
-            </div>
+        return None
+    
+    def register_widget(self):
+        """Register a new widget"""
+        try:
+            data = request.get_json()
             
-            <div class="chat-area" id="chatArea">
-                <div class="message assistant">
-                    Hello! I'm your AI Assistant. I can help you with project estimation, team recommendations, analytics, and more. What would you like to know?
-                </div>
-            </div>
+            client_name = data.get('client_name')
+            domain = data.get('domain')
+            widget_url = data.get('widget_url')
+            widget_config = data.get('widget_config', {})
             
-            <div class="loading" id="loading">AI is thinking...</div>
+            if not all([client_name, domain, widget_url]):
+                return _error_response(_MISSING_FIELDS_BODY, 400)
             
-            <div class="input-area">
-                <input type="text" 
-                       class="message-input" 
-                       id="messageInput" 
-                       placeholder="Type your message..."
-                       onkeypress="handleKeyPress(event)">
-                <button class="send-button" onclick="sendMessage()" id="sendButton">Send</button>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        const WIDGET_ID = '{{ widget_id }}';
-        const API_KEY = '{{ api_key }}';
-        const BASE_URL = '{{ base_url }}';
-        
-        let isLoading = false;
-        
-        function addMessage(content, isUser = false) {
-            const chatArea = document.getElementById('chatArea');
-            const messageDiv = document.createElement('div');
-            messageDiv.className = `message ${isUser ? 'user' : 'assistant'}`;
-            messageDiv.textContent = content;
-            chatArea.appendChild(messageDiv);
-            chatArea.scrollTop = chatArea.scrollHeight;
-        }
+            # Generate API key
+            api_key = self.generate_api_key(client_name, domain)
+            
+            # Authorize widget
+            widget_id = self.authorize_widget(api_key, widget_url, widget_config)
+            
+            return jsonify({
+                "success": True,
+                "api_key": api_key,
+                "widget_id": widget_id,
+                "widget_url": f"/widget/embed/{widget_id}"
+            })
+            
+        except Exception as e:
+            self.logger.error("Widget registration error: %s", e)
+            return jsonify({"error": str(e)}), 400
+    
+    def embed_widget(self, widget_id):
+        """Serve the embeddable widget"""
+        if widget_id not in self.authorized_widgets:
+            return "Widget not found", 404
         
-        function setLoading(loading) {
-            isLoading = loading;
-            document.getElementById('loading').style.display = loading ? 'block' : 'none';
-            document.getElementById('sendButton').disabled = loading;
-            document.getElementById('messageInput').disabled = loading;
-        }
+        widget_data = self.authorized_widgets[widget_id]
+        if not widget_data["active"]:
+            return "Widget disabled", 403
         
-        async function sendMessage() {
-            const input = document.getElementById('messageInput');
-            const message = input.value.trim();
-            
-            if (!message || isLoading) return;
-            
-            addMessage(message, true);
-            input.value = '';
-            setLoading(true);
-            
-            try {
-                const response = await fetch(`${BASE_URL}/api/chat`, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        widget_id: WIDGET_ID,
-                        api_key: API_KEY,
-                        message: message,
-                        context: {
-                            domain: window.location.hostname,
-                            timestamp: new Date().toISOString()
-                        }
-                    })
-                });
-                
-                const data = await response.json();
-                
-                if (data.success) {
-                    addMessage(data.response.message || data.response);
-                } else {
-                    addMessage('Sorry, I encountered an error. Please try again.');
-                }
-                
-            } catch (error) {
-                console.error('Chat error:', error);
-                addMessage('Sorry, I couldn\\'t connect to the server. Please try again.');
-            } finally {
-                setLoading(false);
-            }
-        }
+        # Generate widget HTML; browsers revalidate with the ETag
+        etag, widget_html = self._render_widget_html(widget_id, widget_data)
+        if etag in request.if_none_match:
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+        
+        return Response(widget_html, mimetype="text/html", headers={
+            "ETag": f'"{etag}"',
+            "Cache-Control": "public, max-age=300"
+        })
+    
+    def widget_asset(self, asset_hash, ext):
+        """Serve the shared widget stylesheet or script"""
+        if asset_hash != WIDGET_ASSET_HASH:
+            return "Asset not found", 404
+        
+        if ext == "css":
+            body, mimetype = WIDGET_CSS, "text/css"
+        elif ext == "js":
+            body, mimetype = WIDGET_JS, "application/javascript"
+        else:
+            return "Asset not found", 404
         
-        async function quickAction(action) {
-            if (isLoading) return;
+        return Response(body, mimetype=mimetype, headers={
+            "Cache-Control": "public, max-age=31536000, immutable"
+        })
+    
+    def chat_endpoint(self):
+        """Handle chat requests from widgets"""
+        try:
+            data = request.get_json()
+            widget_id = data.get('widget_id')
+            api_key = data.get('api_key')
+            message = data.get('message')
+            context = data.get('context', {})
             
-            setLoading(true);
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
             
-            try {
-                let response;
-                
-                switch (action) {
-                    case 'estimate':
-                        addMessage('📊 I can help you estimate a project. Please describe your project requirements.', false);
-                        break;
-                        
-                    case 'team':
-                        response = await fetch(`${BASE_URL}/api/data/team?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
-                        const teamData = await response.json();
-                        if (teamData.success) {
-                            addMessage(`👥 Found ${teamData.count} team members available. What kind of skills are you looking for?`, false);
-                        }
-                        break;
-                        
-                    case 'analytics':
-                        response = await fetch(`${BASE_URL}/api/analytics?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
-                        const analyticsData = await response.json();
-                        if (analyticsData.success) {
-                            addMessage('📈 Here\\'s your current analytics overview. Your productivity is looking good!', false);
-                        }
-                        break;
-                        
-                    case 'status':
-                        response = await fetch(`${BASE_URL}/api/status?widget_id=${WIDGET_ID}&api_key=${API_KEY}`);
-                        const statusData = await response.json();
-                        if (statusData.success) {
-                            const status = statusData.status;
-                            addMessage(`⚡ System Status: ${status.data_sources.active_sources}/${status.data_sources.total_sources} data sources active, ${status.widget_count} widgets deployed.`, false);
-                        }
-                        break;
-                }
-                
-            } catch (error) {
-                console.error('Quick action error:', error);
-                addMessage('Sorry, I couldn\\'t complete that action. Please try again.');
-            } finally {
-                setLoading(false);
-            }
-        }
-        
-        function handleKeyPress(event) {
-            if (event.key === 'Enter' && !event.shiftKey) {
-                event.preventDefault();
-                sendMessage();
+            # Process chat message through AI assistant
+            response = self.process_chat_message(message, context, widget_id)
+            
+            return _json_response({
+                "success": True,
+                "response": response
+            })
+            
+        except Exception as e:
+            self.logger.error("Chat endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def estimate_endpoint(self):
+        """Handle project estimation requests"""
+        try:
+            data = request.get_json()
+            widget_id = data.get('widget_id')
+            api_key = data.get('api_key')
+            
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            project_description = data.get('project_description')
+            requirements = data.get('requirements', [])
+            technologies = data.get('technologies', [])
+            deadline = data.get('deadline')
+            
+            # Generate project estimate
+            estimate = self.project_estimator.estimate_project(
+                project_description, requirements, technologies, deadline
+            )
+            
+            # Convert estimate to JSON-serializable format
+            estimate_data = dict(zip(ESTIMATE_FIELDS, _get_estimate_fields(estimate)))
+            
+            return _json_response({
+                "success": True,
+                "estimate": estimate_data
+            })
+            
+        except Exception as e:
+            self.logger.error("Estimate endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def get_projects(self):
+        """Get all projects data"""
+        try:
+            widget_id = request.args.get('widget_id')
+            api_key = request.args.get('api_key')
+            
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            projects = self._shared_fetch("projects", self.data_source_manager.get_all_projects)
+            
+            return _json_response({
+                "success": True,
+                "projects": projects,
+                "count": len(projects)
+            })
+            
+        except Exception as e:
+            self.logger.error("Projects endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def get_team_members(self):
+        """Get team members data"""
+        try:
+            widget_id = request.args.get('widget_id')
+            api_key = request.args.get('api_key')
+            
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            team_members = self.data_source_manager.get_team_members()
+            
+            return _json_response({
+                "success": True,
+                "team_members": team_members,
+                "count": len(team_members)
+            })
+            
+        except Exception as e:
+            self.logger.error("Team endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def get_analytics(self):
+        """Get analytics data"""
+        try:
+            widget_id = request.args.get('widget_id')
+            api_key = request.args.get('api_key')
+            
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            # Get analytics from the main AI assistant
+            analytics_data = self._shared_fetch(
+                "analytics", self.ai_assistant.analytics_engine.get_visual_analytics_data
+            )
+            
+            body, etag = self._analytics_body(analytics_data)
+            headers = {"ETag": f'"{etag}"', "Cache-Control": "private, max-age=30"}
+            if etag in request.if_none_match:
+                return Response(status=304, headers=headers)
+            
+            return Response(body, mimetype="application/json", headers=headers)
+            
+        except Exception as e:
+            self.logger.error("Analytics endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def execute_action(self):
+        """Execute actions through the widget"""
+        try:
+            data = request.get_json()
+            widget_id = data.get('widget_id')
+            api_key = data.get('api_key')
+            
+            if not self.validate_request(widget_id, api_key):
+                return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            action = data.get('action')
+            parameters = data.get('parameters', {})
+            
+            # Execute action through AI assistant's action system
+            result = self.execute_widget_action(action, parameters, widget_id)
+            
+            return _json_response({
+                "success": True,
+                "result": result
+            })
+            
+        except Exception as e:
+            self.logger.error("Action endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def get_status(self):
+        """Get widget and system status"""
+        try:
+            widget_id = request.args.get('widget_id')
+            api_key = request.args.get('api_key')
+            
+            if widget_id and api_key:
+                if not self.validate_request(widget_id, api_key):
+                    return _error_response(_UNAUTHORIZED_BODY, 401)
+            
+            status = {
+                "server_status": "running",
+                "data_sources": self.data_source_manager.get_data_source_status(),
+                "widget_count": len(self.authorized_widgets),
+                "active_sessions": len(self.active_sessions),
+                "last_sync": datetime.now().isoformat()
             }
-        }
-        
-        // Initialize widget
-        document.addEventListener('DOMContentLoaded', function() {
-            console.log('AI Avatar Widget initialized');
             
-            // Send initial status check
-            quickAction('status');
-        });
-    </script>
-</body>
-</html>
-        """
+            return _json_response({
+                "success": True,
+                "status": status
+            })
+            
+        except Exception as e:
+            self.logger.error("Status endpoint error: %s", e)
+            return jsonify({"error": str(e)}), 500
+    
+    def _shared_fetch(self, name: str, loader):
+        """Return a recent result of loader; concurrent misses share one call"""
+        entry = self._fetch_cache.get(name)
+        if entry is not None and time.monotonic() - entry[0] < self.FETCH_CACHE_TTL:
+            return entry[1]
+        
+        with self._fetch_locks[name]:
+            # Another request may have refreshed it while we waited
+            entry = self._fetch_cache.get(name)
+            if entry is not None and time.monotonic() - entry[0] < self.FETCH_CACHE_TTL:
+                return entry[1]
+            
+            value = loader()
+            self._fetch_cache[name] = (time.monotonic(), value)
+            return value
+    
+    def _analytics_body(self, analytics_data: Dict):
+        """Serialize an analytics result once and return (body, etag)"""
+        cached = self._analytics_serialized
+        if cached is not None and cached[0] is analytics_data:
+            return cached[1], cached[2]
+        
+        body = _response_dumps({"success": True, "analytics": analytics_data})
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self._analytics_serialized = (analytics_data, body, etag)
+        return body, etag
+    
+    def generate_widget_html(self, widget_id: str, widget_data: Dict) -> str:
+        """Generate HTML for embeddable widget"""
+        return self._render_widget_html(widget_id, widget_data)[1]
+    
+    def _render_widget_html(self, widget_id: str, widget_data: Dict):
+        """Return (etag, html) for the widget, rendering it on a cache miss"""
+        widget_config = widget_data.get("config", {})
+        
+        # Get the base URL for API calls
+        base_url = request.host_url.rstrip('/')
         
-        from jinja2 import Template
-        template = Template(html_template)
+        cached = self._html_cache.get(widget_id)
+        if cached is not None and cached[0] == base_url:
+            return cached[1], cached[2]
         
-        return template.render(
+        html = WIDGET_HTML_TEMPLATE.format_map(dict(
             widget_id=widget_id,
             api_key=widget_data["api_key"],
-            base_url=request.host_url.rstrip('/'),
+            base_url=base_url,
             width=widget_config.get("width", "400px"),
-            height=widget_config.get("height", "500px")
-        )
+            height=widget_config.get("height", "500px"),
+            asset_hash=WIDGET_ASSET_HASH
+        ))
+        etag = hashlib.sha256(html.encode("utf-8")).hexdigest()[:16]
+        
+        self._html_cache[widget_id] = (base_url, etag, html)
+        return etag, html
     
     def process_chat_message(self, message: str, context: Dict, widget_id: str) -> Dict:
         """Process chat message through the AI assistant"""
@@ -805,7 +1223,7 @@ class WidgetAPIServer:
             }
             
         except Exception as e:
-            self.logger.error(f"Chat processing error: {e}")
+            self.logger.error("Chat processing error: %s", e)
             return {
                 "message": "I apologize, but I encountered an error processing your request. Please try again.",
                 "actions": [],
@@ -814,106 +1232,140 @@ class WidgetAPIServer:
     
     def generate_fallback_response(self, message: str, context: Dict) -> Dict:
         """Generate fallback responses when AI system is not available"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ['estimate', 'project', 'cost', 'time']):
-            return {
-                "message": "I can help you estimate your project! Please provide more details about your project requirements, technologies, and timeline.",
-                "actions": ["show_estimation_form"]
-            }
-        
-        elif any(word in message_lower for word in ['team', 'member', 'skill', 'developer']):
-            return {
-                "message": "I can recommend team members based on your project needs. What skills or roles are you looking for?",
-                "actions": ["show_team_search"]
-            }
-        
-        elif any(word in message_lower for word in ['analytics', 'report', 'data', 'insight']):
-            return {
-                "message": "I can provide analytics and insights about your projects and team performance. What specific metrics would you like to see?",
-                "actions": ["show_analytics"]
-            }
+        match = _INTENT_RE.match(message)
+        intent = match.lastgroup if match else None
         
-        elif any(word in message_lower for word in ['status', 'health', 'system']):
-            status = self.data_source_manager.get_data_source_status()
+        if intent == "status":
+            status = self._shared_fetch(
+                "data_source_status", self.data_source_manager.get_data_source_status
+            )
             return {
-                "message": f"System is running well! {status['active_sources']} data sources are active out of {status['total_sources']} total sources.",
-                "actions": ["show_detailed_status"]
+                "message": _FALLBACK_STATUS_TEMPLATE % (status['active_sources'], status['total_sources']),
+                "actions": _FALLBACK_STATUS_ACTIONS
             }
         
-        else:
-            return {
-                "message": "I'm here to help with project estimation, team recommendations, analytics, and system management. How can I assist you today?",
-                "actions": ["show_help_menu"]
-            }
+        return _FALLBACK_REPLIES.get(intent, _FALLBACK_REPLIES[None])
     
     def execute_widget_action(self, action: str, parameters: Dict, widget_id: str) -> Dict:
         """Execute actions requested through the widget"""
         try:
             widget_data = self.authorized_widgets[widget_id]
             
-            if action == "estimate_project":
-                # Generate project estimate
-                estimate = self.project_estimator.estimate_project(
-                    parameters.get("description", ""),
-                    parameters.get("requirements", []),
-                    parameters.get("technologies", []),
-                    parameters.get("deadline")
-                )
-                
-                return {
-                    "action": action,
-                    "result": {
-                        "project_name": estimate.project_name,
-                        "total_hours": estimate.total_hours,
-                        "difficulty": estimate.difficulty_level,
-                        "confidence": estimate.confidence_level,
-                        "team_size": estimate.recommended_team_size
-                    }
-                }
+            cache_key = self._action_cache_key(action, parameters)
+            if cache_key is not None:
+                with self._result_lock:
+                    entry = self._result_cache.get(cache_key)
+                    if entry is not None and time.monotonic() - entry[0] < self.RESULT_CACHE_TTL:
+                        self._result_cache.move_to_end(cache_key)
+                        # Callers may modify the response, so each hit gets its own copy
+                        return copy.deepcopy(entry[1])
             
-            elif action == "search_team":
-                # Search for team members
-                team_members = self.data_source_manager.get_team_members()
-                skills = parameters.get("skills", [])
-                
-                # Filter team members by skills
-                filtered_members = []
-                for member in team_members:
-                    member_skills = member.get("skills", [])
-                    if any(skill.lower() in [s.lower() for s in member_skills] for skill in skills):
-                        filtered_members.append(member)
-                
-                return {
-                    "action": action,
-                    "result": {
-                        "members": filtered_members[:5],  # Top 5 matches
-                        "total_found": len(filtered_members)
-                    }
-                }
+            response = self._run_widget_action(action, parameters)
             
-            elif action == "get_analytics":
-                # Get analytics data
-                analytics_data = self.ai_assistant.analytics_engine.get_visual_analytics_data()
-                
-                return {
-                    "action": action,
-                    "result": analytics_data
-                }
+            # Only successful results are reused
+            result = response.get("result")
+            if cache_key is not None and not (isinstance(result, dict) and "error" in result):
+                with self._result_lock:
+                    self._result_cache[cache_key] = (time.monotonic(), copy.deepcopy(response))
+                    self._result_cache.move_to_end(cache_key)
+                    while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+            
+            return response
             
-            else:
-                return {
-                    "action": action,
-                    "result": {"error": f"Unknown action: {action}"}
-                }
-                
         except Exception as e:
-            self.logger.error(f"Action execution error: {e}")
+            self.logger.error("Action execution error: %s", e)
             return {
                 "action": action,
                 "result": {"error": str(e)}
             }
     
+    def _action_cache_key(self, action: str, parameters: Dict):
+        """Return a canonical cache key for an action, or None if it must not be cached"""
+        # Deadlines are relative to the current time, so those estimates are always fresh
+        if action not in self._CACHEABLE_ACTIONS or parameters.get("deadline"):
+            return None
+        
+        try:
+            payload = _canonical_dumps(parameters)
+        except TypeError:
+            return None
+        
+        return action, hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _team_skills_index(self):
+        """Return [(member, casefolded skill set)] for the current team snapshot"""
+        team_members = self.data_source_manager.get_team_members()
+        
+        # The data source replaces the list when it syncs, so identity marks a snapshot
+        cached = self._skills_index
+        if cached is not None and cached[0] is team_members:
+            return cached[1]
+        
+        index = [
+            (member, frozenset(map(str.casefold, member.get("skills", []))))
+            for member in team_members
+        ]
+        self._skills_index = (team_members, index)
+        return index
+    
+    def _run_widget_action(self, action: str, parameters: Dict) -> Dict:
+        """Run a widget action without caching"""
+        if action == "estimate_project":
+            # Generate project estimate
+            estimate = self.project_estimator.estimate_project(
+                parameters.get("description", ""),
+                parameters.get("requirements", []),
+                parameters.get("technologies", []),
+                parameters.get("deadline")
+            )
+            
+            return {
+                "action": action,
+                "result": {
+                    "project_name": estimate.project_name,
+                    "total_hours": estimate.total_hours,
+                    "difficulty": estimate.difficulty_level,
+                    "confidence": estimate.confidence_level,
+                    "team_size": estimate.recommended_team_size
+                }
+            }
+        
+        elif action == "search_team":
+            # Search for team members
+            skills = frozenset(map(str.casefold, parameters.get("skills", [])))
+            
+            # Filter team members by skills
+            filtered_members = [
+                member for member, member_skills in self._team_skills_index()
+                if skills & member_skills
+            ]
+            
+            return {
+                "action": action,
+                "result": {
+                    "members": filtered_members[:5],  # Top 5 matches
+                    "total_found": len(filtered_members)
+                }
+            }
+        
+        elif action == "get_analytics":
+            # Get analytics data
+            analytics_data = self._shared_fetch(
+                "analytics", self.ai_assistant.analytics_engine.get_visual_analytics_data
+            )
+            
+            return {
+                "action": action,
+                "result": analytics_data
+            }
+        
+        else:
+            return {
+                "action": action,
+                "result": {"error": f"Unknown action: {action}"}
+            }
+    
     def start_server(self):
         """Start the widget API server"""
         if self.is_running:
@@ -921,39 +1373,57 @@ class WidgetAPIServer:
         
         def run_server():
             try:
-                self.app.run(
-                    host='0.0.0.0',
-                    port=self.port,
-                    debug=False,
-                    use_reloader=False,
-                    threaded=True
-                )
+                if WAITRESS_AVAILABLE:
+                    self._wsgi_server = create_server(
+                        self.app, host='0.0.0.0', port=self.port, threads=self.SERVER_THREADS
+                    )
+                    self._wsgi_server.run()
+                else:
+                    self.app.run(
+                        host='0.0.0.0',
+                        port=self.port,
+                        debug=False,
+                        use_reloader=False,
+                        threaded=True
+                    )
             except Exception as e:
-                self.logger.error(f"Server error: {e}")
+                self.logger.error("Server error: %s", e)
         
         self.server_thread = threading.Thread(target=run_server, daemon=True)
         self.server_thread.start()
         self.is_running = True
         
-        self.logger.info(f"Widget API server started on port {self.port}")
+        self.logger.info("Widget API server started on port %s", self.port)
     
     def stop_server(self):
         """Stop the widget API server"""
         self.is_running = False
+        if self._wsgi_server is not None:
+            self._wsgi_server.close()
+            self._wsgi_server = None
         if self.server_thread:
             self.server_thread.join(timeout=1.0)
         
+        self._flush_usage()
+        
+        # Write any pending configuration changes
+        if self._config_dirty.is_set():
+            self._config_dirty.clear()
+            self._write_configuration()
+        
         self.logger.info("Widget API server stopped")
     
     def get_widget_status(self) -> Dict:
         """Get current widget status"""
+        self._flush_usage()
+        
         return {
             "server_running": self.is_running,
             "port": self.port,
             "total_widgets": len(self.authorized_widgets),
-            "active_widgets": sum(1 for w in self.authorized_widgets.values() if w["active"]),
+            "active_widgets": self._counts["active_widgets"],
             "total_api_keys": len(self.api_keys),
-            "active_api_keys": sum(1 for k in self.api_keys.values() if k["active"]),
+            "active_api_keys": self._counts["active_api_keys"],
             "active_sessions": len(self.active_sessions)
         }
 
@@ -961,12 +1431,16 @@ class WidgetAPIServer:
 class WidgetIntegrationManager:
     """Manages widget integration for the AI Avatar Assistant"""
     
+    # Integration snippets remembered per (client_name, domain, widget_url)
+    INTEGRATION_CACHE_SIZE = 128
+    
     def __init__(self, ai_assistant, data_source_manager, project_estimator):
         self.ai_assistant = ai_assistant
         self.data_source_manager = data_source_manager
         self.project_estimator = project_estimator
         self.widget_server = None
-        self.logger = logging.getLogger(__name__)
+        self._integration_cache = OrderedDict()
+        self.logger = logger
     
     def initialize_widget_api(self, port: int = 5555):
         """Initialize the widget API server"""
@@ -979,12 +1453,12 @@ class WidgetIntegrationManager:
             )
             
             self.widget_server.start_server()
-            self.logger.info(f"Widget API initialized on port {port}")
+            self.logger.info("Widget API initialized on port %s", port)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize widget API: {e}")
+            self.logger.error("Failed to initialize widget API: %s", e)
             return False
     
     def generate_integration_code(self, client_name: str, domain: str, widget_url: str) -> Dict:
@@ -992,85 +1466,40 @@ class WidgetIntegrationManager:
         if not self.widget_server:
             raise ValueError("Widget API not initialized")
         
+        cache_key = (client_name, domain, widget_url)
+        cached = self._integration_cache.get(cache_key)
+        if cached is not None:
+            self._integration_cache.move_to_end(cache_key)
+            return dict(cached)
+        
         try:
             # Generate API key and authorize widget
             api_key = self.widget_server.generate_api_key(client_name, domain)
             widget_id = self.widget_server.authorize_widget(api_key, widget_url, {})
             
             # Generate integration code
-            integration_code = f"""
-<!-- AI Avatar Assistant Widget Integration -->
-<div id="ai-avatar-widget-container"></div>
-
-<script>
-(function() {{
-    const widgetContainer = document.getElementById('ai-avatar-widget-container');
-    const iframe = document.createElement('iframe');
-    
-    iframe.src = 'http://localhost:{self.widget_server.port}/widget/embed/{widget_id}';
-    iframe.style.width = '400px';
-    iframe.style.height = '500px';
-    iframe.style.border = '1px solid #ddd';
-    iframe.style.borderRadius = '8px';
-    iframe.frameBorder = '0';
-    iframe.allowTransparency = 'true';
-    
-    widgetContainer.appendChild(iframe);
-    
-    // Widget API for custom interactions
-    window.AIAvatar = {{
-        widgetId: '{widget_id}',
-        apiKey: '{api_key}',
-        baseUrl: 'http://localhost:{self.widget_server.port}',
-        
-        async chat(message) {{
-            const response = await fetch(this.baseUrl + '/api/chat', {{
-                method: 'POST',
-                headers: {{ 'Content-Type': 'application/json' }},
-                body: JSON.stringify({{
-                    widget_id: this.widgetId,
-                    api_key: this.apiKey,
-                    message: message
-                }})
-            }});
-            return await response.json();
-        }},
-        
-        async estimate(projectData) {{
-            const response = await fetch(this.baseUrl + '/api/estimate', {{
-                method: 'POST',
-                headers: {{ 'Content-Type': 'application/json' }},
-                body: JSON.stringify({{
-                    widget_id: this.widgetId,
-                    api_key: this.apiKey,
-                    ...projectData
-                }})
-            }});
-            return await response.json();
-        }},
-        
-        async getAnalytics() {{
-            const response = await fetch(
-                `${{this.baseUrl}}/api/analytics?widget_id=${{this.widgetId}}&api_key=${{this.apiKey}}`
-            );
-            return await response.json();
-        }}
-    }};
-}})();
-</script>
-            """
+            integration_code = _INTEGRATION_TEMPLATE.substitute(
+                port=self.widget_server.port, widget_id=widget_id, api_key=api_key
+            )
             
-            return {
+            integration = {
                 "success": True,
                 "api_key": api_key,
                 "widget_id": widget_id,
-                "integration_code": integration_code.strip(),
+                "integration_code": integration_code,
                 "widget_url": f"http://localhost:{self.widget_server.port}/widget/embed/{widget_id}",
                 "api_endpoint": f"http://localhost:{self.widget_server.port}/api"
             }
             
+            # Reloading the same dashboard reuses its key instead of issuing a new one
+            self._integration_cache[cache_key] = integration
+            while len(self._integration_cache) > self.INTEGRATION_CACHE_SIZE:
+                self._integration_cache.popitem(last=False)
+            
+            return dict(integration)
+            
         except Exception as e:
-            self.logger.error(f"Failed to generate integration code: {e}")
+            self.logger.error("Failed to generate integration code: %s", e)
             raise
     
     def get_widget_dashboard_url(self) -> str:
@@ -10,9 +10,42 @@ import json
 import time
 import threading
 import webbrowser
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+# Raw descriptor flags skip the io layer's buffering setup and tty probe
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+def _write_json(path: str, obj) -> None:
+    """Serialize obj and write it to path with plain open/write/close syscalls"""
+    data = memoryview(_dumps(obj))
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def _write_json_files(files, pool: ThreadPoolExecutor = None) -> None:
+    """Write (path, obj) pairs, overlapping the file syscalls when a pool is given"""
+    if pool is None:
+        for path, obj in files:
+            _write_json(path, obj)
+    else:
+        # list() waits for every write and re-raises the first failure
+        list(pool.map(lambda item: _write_json(*item), files))
+
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -43,14 +76,18 @@ class AIAvatarDemo:
         os.makedirs("data/demo/reports", exist_ok=True)
         os.makedirs("logs", exist_ok=True)
         
-        # Create sample project data
-        self.create_sample_projects()
-        self.create_sample_team_data()
-        self.create_sample_configurations()
+        # Records kept in memory for the data source manager, keyed like its cache
+        self._preloaded = {}
+        
+        # Create sample project data; one pool serves all the small file writes
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.create_sample_projects(pool)
+            self.create_sample_team_data(pool)
+            self.create_sample_configurations(pool)
         
         print("✅ Demo environment ready!")
     
-    def create_sample_projects(self):
+    def create_sample_projects(self, pool: ThreadPoolExecutor = None):
         """Create sample project JSON files"""
         projects = [
             {
@@ -143,11 +180,12 @@ class AIAvatarDemo:
             }
         ]
         
-        for project in projects:
-            with open(f"data/demo/projects/{project['id']}.json", 'w') as f:
-                json.dump(project, f, indent=2)
+        self._preloaded["projects"] = projects
+        _write_json_files(
+            [(f"data/demo/projects/{project['id']}.json", project) for project in projects], pool
+        )
     
-    def create_sample_team_data(self):
+    def create_sample_team_data(self, pool: ThreadPoolExecutor = None):
         """Create sample team member data"""
         team_members = [
             {
@@ -230,42 +268,46 @@ class AIAvatarDemo:
             }
         ]
         
-        for member in team_members:
-            with open(f"data/demo/team/{member['id']}.json", 'w') as f:
-                json.dump(member, f, indent=2)
+        self._preloaded["team_members"] = team_members
+        _write_json_files(
+            [(f"data/demo/team/{member['id']}.json", member) for member in team_members], pool
+        )
     
-    def create_sample_configurations(self):
+    def create_sample_configurations(self, pool: ThreadPoolExecutor = None):
         """Create sample configuration files"""
-        # Data sources configuration
+        # Data sources configuration, in the list format DataSourceManager loads
         data_sources_config = {
-            "data_sources": {
-                "demo_projects": {
-                    "source_type": "json_folder",
+            "data_sources": [
+                {
+                    "id": "demo_projects",
+                    "type": "json_folder",
                     "name": "Demo Projects",
                     "config": {
                         "folder_path": "data/demo/projects",
                         "file_pattern": "*.json",
                         "recursive": False
                     },
-                    "is_active": True,
-                    "created_at": datetime.now().isoformat()
+                    "active": True
                 },
-                "demo_team": {
-                    "source_type": "json_folder", 
+                {
+                    "id": "demo_team",
+                    "type": "json_folder",
                     "name": "Demo Team",
                     "config": {
                         "folder_path": "data/demo/team",
                         "file_pattern": "*.json",
                         "recursive": False
                     },
-                    "is_active": True,
-                    "created_at": datetime.now().isoformat()
+                    "active": True
                 }
+            ],
+            "settings": {
+                "watch_interval": 30,
+                "auto_sync": True
             }
         }
         
-        with open("data/data_sources.json", 'w') as f:
-            json.dump(data_sources_config, f, indent=2)
+        _write_json_files([("data/data_sources.json", data_sources_config)], pool)
     
     def init_components(self):
         """Initialize AI Avatar Assistant components"""
@@ -273,6 +315,8 @@ class AIAvatarDemo:
         
         # Core components
         self.data_source_manager = DataSourceManager()
+        if self._preloaded:
+            self.data_source_manager.preload_records(self._preloaded)
         self.project_estimator = ProjectEstimator(self.data_source_manager)
         self.analytics_engine = LiveAnalyticsEngine()
         self.voice_system = VoiceNotificationSystem()
@@ -312,9 +356,12 @@ class AIAvatarDemo:
         status = self.data_source_manager.get_data_source_status()
         print(f"📊 Data Sources: {status['active_sources']}/{status['total_sources']} active")
         
-        # Sync all sources
-        print("🔄 Syncing data sources...")
-        self.data_source_manager.sync_all_sources()
+        # Sync all sources, unless the demo records were handed over in memory
+        if self._preloaded:
+            print("⚡ Using demo data preloaded from memory")
+        else:
+            print("🔄 Syncing data sources...")
+            self.data_source_manager.sync_all_sources()
         
         # Show loaded data
         projects = self.data_source_manager.get_all_projects()
@@ -410,22 +457,36 @@ class AIAvatarDemo:
         required_skills = ["react", "node.js", "postgresql"]
         print(f"🎯 Finding team members for skills: {', '.join(required_skills)}")
         
-        recommendations = []
-        for member in team_members:
+        # Inverted index of lowercased skill -> member positions, built once
+        skill_index = defaultdict(set)
+        for i, member in enumerate(team_members):
             member_skills = member.get('skills', [])
             if isinstance(member_skills, str):
                 member_skills = [member_skills]
-            
-            # Calculate skill matches
-            matches = sum(1 for skill in required_skills if 
-                         any(skill.lower() in ms.lower() for ms in member_skills))
-            
-            if matches > 0:
-                recommendations.append({
-                    'member': member,
-                    'matches': matches,
-                    'match_percentage': (matches / len(required_skills)) * 100
-                })
+            for ms in member_skills:
+                skill_index[ms.lower()].add(i)
+        
+        required_lower = [skill.lower() for skill in required_skills]
+        
+        # Count each required skill once per member, matching it as a
+        # substring of the distinct indexed skills
+        match_counts = Counter()
+        for skill in required_lower:
+            matched = set()
+            for indexed_skill, positions in skill_index.items():
+                if skill in indexed_skill:
+                    matched |= positions
+            match_counts.update(matched)
+        
+        # Member order is kept so equal matches rank as before
+        recommendations = [
+            {
+                'member': team_members[i],
+                'matches': matches,
+                'match_percentage': (matches / len(required_skills)) * 100
+            }
+            for i, matches in sorted(match_counts.items())
+        ]
         
         # Sort by matches
         recommendations.sort(key=lambda x: x['matches'], reverse=True)
@@ -7,7 +7,9 @@ Test only the core components without GUI dependencies
 import os
 import sys
 import json
-from datetime import datetime
+import time
+import tempfile
+from datetime import datetime, timedelta
 
 def test_core_data_management():
     """Test data source management without external dependencies"""
@@ -264,6 +266,108 @@ def test_ai_engine():
         print(f"  ❌ Failed: {e}")
         return False
 
+def test_task_database():
+    """Test bulk task inserts, bulk status updates and truncation"""
+    print("\n🗃️ Testing Task Database...")
+    
+    try:
+        from core.database import TaskDatabase
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = TaskDatabase(os.path.join(tmp_dir, "tasks.db"))
+            
+            deadline = datetime.now() + timedelta(days=1)
+            task_ids = db.add_tasks_bulk([
+                {"title": "Write report", "deadline": deadline, "priority": 2},
+                {"title": "Review PR", "description": "Widget API changes"},
+                {"title": "Plan sprint", "deadline": deadline, "metadata": {"sprint": 4}}
+            ])
+            assert len(task_ids) == 3, f"expected 3 task ids, got {task_ids}"
+            assert len(db.get_tasks()) == 3, "bulk insert did not store every task"
+            print(f"  ✅ add_tasks_bulk stored {len(task_ids)} tasks")
+            
+            updated = db.update_tasks_status(task_ids[:2], "completed")
+            assert updated == 2, f"expected 2 updated rows, got {updated}"
+            assert len(db.get_tasks(status="completed")) == 2, "status update did not apply"
+            assert db.update_tasks_status([], "completed") == 0, "empty update should be a no-op"
+            print(f"  ✅ update_tasks_status updated {updated} tasks")
+            
+            db.truncate_all()
+            assert db.get_tasks() == [], "truncate_all left tasks behind"
+            new_ids = db.add_tasks_bulk([{"title": "Fresh start"}])
+            assert new_ids == [1], f"ids were not reset, got {new_ids}"
+            db.truncate_all(vacuum=True)
+            assert db.get_tasks() == [], "truncate_all with vacuum left tasks behind"
+            print("  ✅ truncate_all cleared the tables and reset ids")
+        
+        print("  ✅ Task database working!")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+def test_voice_queue():
+    """Test speech queue grouping, deduplication and eviction without a TTS engine"""
+    print("\n🔊 Testing Voice Notification Queue...")
+    
+    try:
+        from core.voice_system import VoiceNotificationSystem
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            voice = VoiceNotificationSystem(os.path.join(tmp_dir, "config.json"))
+        
+        # Queue only; the speech worker is never started, so nothing is spoken
+        voice.enabled = True
+        voice.is_initialized = True
+        voice._init_pending = False
+        pending = voice._speech_pending
+        
+        assert voice.speak_notifications_bulk([("Build passed", "low"), ("Deploy failed", "urgent")])
+        assert len(pending) == 1, "bulk notifications were not queued as one utterance"
+        assert pending[0]["text"] == "Build passed. Deploy failed.", pending[0]["text"]
+        assert pending[0]["urgency"] == "urgent", "bulk utterance did not take the highest urgency"
+        print("  ✅ speak_notifications_bulk queued one utterance")
+        pending.clear()
+        
+        voice.speak_task_notification("Report", "reminder")
+        voice.speak_task_notification("Invoice", "overdue")
+        assert not pending, "task notifications were queued before the buffer window closed"
+        time.sleep(voice.TASK_NOTIFICATION_WINDOW + 0.3)
+        assert len(pending) == 1, f"expected one grouped notification, got {len(pending)}"
+        assert "Report" in pending[0]["text"] and "Invoice" in pending[0]["text"]
+        print(f"  ✅ Task notifications grouped after {voice.TASK_NOTIFICATION_WINDOW * 1000:.0f} ms")
+        pending.clear()
+        
+        assert voice.speak_notification("Meeting in five minutes")
+        assert voice.speak_notification("Meeting in five minutes")
+        assert len(pending) == 1, "duplicate notification was queued twice"
+        print("  ✅ Duplicate notifications deduplicated")
+        pending.clear()
+        
+        for i in range(voice.MAX_PENDING_SPEECH):
+            voice.speak_notification(f"Update {i}", "normal")
+        assert not voice.speak_notification("Background sync", "low"), "full queue accepted a less urgent item"
+        assert voice.speak_notification("Server down", "urgent"), "full queue rejected an urgent item"
+        assert len(pending) == voice.MAX_PENDING_SPEECH, "queue grew past its bound"
+        assert pending[0]["text"] == "Update 1", "the oldest least urgent item was not evicted"
+        print("  ✅ Full queue evicted the oldest least urgent notification")
+        
+        voice.stop_all_speech()
+        assert not pending, "stop_all_speech left queued speech"
+        voice.shutdown()
+        
+        print("  ✅ Voice notification queue working!")
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def demonstrate_orchestration():
     """Demonstrate the orchestration capabilities"""
     print("\n🚀 ORCHESTRATION DEMONSTRATION")
@@ -353,7 +457,9 @@ def main():
         ("Project Estimation", test_project_estimation),
         ("Team Recommendations", test_team_recommendations),
         ("Analytics Engine", test_analytics_engine),
-        ("AI Engine", test_ai_engine)
+        ("AI Engine", test_ai_engine),
+        ("Task Database", test_task_database),
+        ("Voice Notification Queue", test_voice_queue)
     ]
     
     results = []